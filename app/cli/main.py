@@ -1,11 +1,22 @@
 import asyncio
+import statistics
+import subprocess
+import time
 
 import click
+from pwdlib.hashers.argon2 import Argon2Hasher
 from rich.console import Console
 
+from app.config import settings
 from app.database.core import AsyncSessionLocal
+from app.email.rendering import DEFAULT_MJML_COMMAND, build_templates
+from app.outbox.publisher import task_publisher
+from app.outbox.relay import outbox_relay
+from app.task_results import purge_task_results as purge_task_results_task
 from app.users.models import User
+from app.users.repository import LoginThrottleRepository, RevokedTokenRepository
 from app.users.service import UserService
+from app.users.throttling import login_throttle
 
 from .validate import (
     get_valid_email,
@@ -83,3 +94,175 @@ def createuser() -> None:
         display.success(f"User created successfully: {user.email}")
     except Exception as e:
         display.error(f"Error: could not create user {e}")
+
+
+@cli.command()
+@click.option(
+    "--mjml",
+    default=" ".join(DEFAULT_MJML_COMMAND),
+    show_default=True,
+    help="Command running the MJML CLI.",
+)
+def build_email_templates(mjml: str) -> None:
+    """
+    Compiles the MJML email sources into the HTML templates emails are rendered from
+    """
+    display = Display()
+
+    try:
+        built = build_templates(mjml_command=mjml.split())
+    except (OSError, subprocess.CalledProcessError) as e:
+        display.error(f"Error: could not build the email templates {e}")
+        return
+
+    for template in built:
+        display.log(str(template))
+    display.success(f"Built {len(built)} email templates")
+
+
+@cli.command()
+def relay_outbox() -> None:
+    """
+    Publishes the tasks written to the outbox to Celery until interrupted
+    """
+    display = Display()
+    display.log(
+        f"Relaying the outbox in batches of {outbox_relay.batch_size}, "
+        f"polling every {settings.OUTBOX_POLL_SECONDS}s, "
+        f"logging the publisher stats every {settings.OUTBOX_STATS_SECONDS}s"
+    )
+
+    try:
+        asyncio.run(
+            outbox_relay.run(
+                AsyncSessionLocal,
+                poll_interval=settings.OUTBOX_POLL_SECONDS,
+                stats_interval=settings.OUTBOX_STATS_SECONDS,
+            )
+        )
+    except KeyboardInterrupt:
+        display.warning("Stopped relaying the outbox")
+    finally:
+        # the claimed messages were confirmed or will be retried, stop the thread
+        task_publisher.close(timeout=5)
+        display.log(f"Publisher stats: {task_publisher.stats()}")
+
+
+@cli.command()
+def purge_revoked_tokens() -> None:
+    """
+    Deletes the revoked tokens that expired, run it periodically to keep the denylist small
+    """
+    display = Display()
+
+    async def purge() -> int:
+        async with AsyncSessionLocal() as session:
+            return await RevokedTokenRepository(session).delete_expired()
+
+    try:
+        deleted = asyncio.run(purge())
+        display.success(f"Deleted {deleted} expired revoked tokens")
+    except Exception as e:
+        display.error(f"Error: could not purge revoked tokens {e}")
+
+
+@cli.command()
+def purge_login_throttle() -> None:
+    """
+    Deletes the login throttle buckets that are full again, run it periodically with
+    LOGIN_THROTTLE_BACKEND=database
+    """
+    display = Display()
+
+    async def purge() -> int:
+        async with AsyncSessionLocal() as session:
+            return await LoginThrottleRepository(session).delete_idle(
+                before=time.time() - login_throttle.idle_seconds
+            )
+
+    try:
+        deleted = asyncio.run(purge())
+        display.success(f"Deleted {deleted} idle login throttle buckets")
+    except Exception as e:
+        display.error(f"Error: could not purge login throttle buckets {e}")
+
+
+@cli.command()
+def purge_task_results() -> None:
+    """
+    Deletes the expired task results with CELERY_RESULTS=database, celery beat runs it
+    periodically
+    """
+    display = Display()
+
+    if settings.CELERY_RESULTS != "database":
+        display.log("Task results aren't stored in a database, nothing to purge")
+        return
+
+    try:
+        deleted = purge_task_results_task()
+        display.success(f"Deleted {deleted} expired task results")
+    except Exception as e:
+        display.error(f"Error: could not purge task results {e}")
+
+
+def hash_time(hasher: Argon2Hasher, rounds: int = 5) -> float:
+    """Returns the median milliseconds `hasher` takes to hash a password."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        hasher.hash("calibration password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+@cli.command()
+@click.option(
+    "--target-ms",
+    default=250.0,
+    show_default=True,
+    help="Time a single hash should take on this host.",
+)
+@click.option(
+    "--memory-cost",
+    default=settings.PASSWORD_HASH_MEMORY_COST,
+    show_default=True,
+    help="Memory used per hash, in KiB. Halved if even one iteration is too slow.",
+)
+@click.option(
+    "--parallelism", default=settings.PASSWORD_HASH_PARALLELISM, show_default=True
+)
+def calibrate_hash(target_ms: float, memory_cost: int, parallelism: int) -> None:
+    """
+    Benchmarks Argon2 on this host and suggests parameters for a target latency
+    """
+    display = Display()
+    display.line("Calibrate Password Hash")
+
+    # below ~19 MiB Argon2 stops being meaningfully memory hard
+    min_memory_cost = 19 * 1024
+    time_cost = 1
+    elapsed = hash_time(Argon2Hasher(time_cost, memory_cost, parallelism))
+    while elapsed > target_ms and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+        elapsed = hash_time(Argon2Hasher(time_cost, memory_cost, parallelism))
+
+    while True:
+        next_elapsed = hash_time(Argon2Hasher(time_cost + 1, memory_cost, parallelism))
+        if next_elapsed > target_ms:
+            break
+        time_cost += 1
+        elapsed = next_elapsed
+
+    if elapsed > target_ms:
+        display.warning(
+            f"This host can't hash in {target_ms:.0f}ms, the cheapest parameters take {elapsed:.0f}ms"
+        )
+    else:
+        display.success(f"A hash takes {elapsed:.0f}ms with")
+    display.log(f"PASSWORD_HASH_TIME_COST={time_cost}")
+    display.log(f"PASSWORD_HASH_MEMORY_COST={memory_cost}")
+    display.log(f"PASSWORD_HASH_PARALLELISM={parallelism}")
+    display.log(
+        "Existing hashes are upgraded to the new parameters on the next login of each user"
+    )
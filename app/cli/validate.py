@@ -1,9 +1,13 @@
+from typing import TYPE_CHECKING
+
 from pydantic import ValidationError
 
-from app.cli.main import Display
 from app.email.utils import Email
 from app.users.schema import PasswordModel
 
+if TYPE_CHECKING:
+    from app.cli.main import Display
+
 
 def validate_email(email: str) -> bool:
     try:
@@ -21,7 +25,7 @@ def validate_password(password: str) -> bool:
         return False
 
 
-def get_valid_email(display: Display) -> str:
+def get_valid_email(display: "Display") -> str:
     while True:
         email = display.capture_input("Email Address: ")
         if validate_email(email):
@@ -29,7 +33,7 @@ def get_valid_email(display: Display) -> str:
         display.error("Error: Invalid email")
 
 
-def get_valid_password(display: Display) -> str:
+def get_valid_password(display: "Display") -> str:
     while True:
         password1 = display.capture_input("Password: ")
         password2 = display.capture_input("Password (again): ")
@@ -37,9 +37,6 @@ def parse_cors(v: Any) -> list[str] | str:
 CeleryBrokerUrl = Annotated[
     MultiHostUrl, UrlConstraints(allowed_schemes=["amqp", "pyamqp"])
 ]  # assumes rabbitmq
-CeleryBackendUrl = Annotated[
-    MultiHostUrl, UrlConstraints(allowed_schemes=["db+postgresql"])
-]
 
 
 class Settings(BaseSettings):
@@ -50,8 +47,15 @@ class Settings(BaseSettings):
     APP_NAME: str
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
+    # short lived, clients get new ones with their refresh token
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     # 60 minutes * 24 hours * 8 days = 8 days
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # asymmetric algorithms sign with a private <JWT_SIGNING_KEY_ID>.pem of JWT_KEYS_DIR
+    # and publish the public keys of the directory in the JWKS, see app/users/keys.py
+    JWT_ALGORITHM: Literal["HS256", "EdDSA", "ES256"] = "HS256"
+    JWT_KEYS_DIR: Path | None = None
+    JWT_SIGNING_KEY_ID: str | None = None
     DOMAIN: str = "localhost"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     LOG_LEVEL: Literal["TRACE", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = (
@@ -92,22 +96,94 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # comma separated, plain SELECTs are spread across them when set
+    POSTGRES_REPLICA_URIS: Annotated[
+        list[PostgresDsn] | str, BeforeValidator(parse_cors)
+    ] = []
+    # pin sessions to the primary after their first write
+    POSTGRES_READ_YOUR_WRITES: bool = True
+
+    # per engine, the primary and each replica get their own pool
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+
+    # principals of recently seen access tokens are cached per process for this long
+    AUTH_CACHE_TTL_SECONDS: float = 5
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+    # access tokens carry the role and state of the user, authorized without querying it
+    AUTH_STATELESS_TOKENS: bool = False
+    # tokens revoked by other workers are rejected at most this many seconds later
+    REVOCATION_REFRESH_SECONDS: float = 5
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    # revocations committing later than this after getting their id can be missed
+    REVOCATION_OVERLAP_SECONDS: float = 60
+    # token buckets of login attempts per client IP and per account, refilled per minute,
+    # "database" shares them between workers
+    LOGIN_THROTTLE_BACKEND: Literal["memory", "database"] = "memory"
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = 10
+    LOGIN_THROTTLE_IP_BURST: int = 20
+    LOGIN_THROTTLE_ACCOUNT_PER_MINUTE: float = 5
+    LOGIN_THROTTLE_ACCOUNT_BURST: int = 10
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
     SMTP_HOST: str | None = None
     SMTP_USER: str | None = None
     SMTP_PASSWORD: str | None = None
+    # connections kept open by each worker process, reused across emails
+    SMTP_POOL_SIZE: int = 1
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    # idle connections are checked with NOOP before reuse after this many seconds
+    SMTP_KEEPALIVE_SECONDS: float = 30
+    SMTP_TIMEOUT: float = 10
     EMAILS_FROM_EMAIL: EmailStr | None = None
     EMAILS_FROM_NAME: str | None = None
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # recipients per task of a bulk email
+    BULK_EMAIL_CHUNK_SIZE: int = 500
+    # compiled email templates are cached here, defaults to the system temp dir
+    EMAIL_TEMPLATE_CACHE_DIR: Path | None = None
+
+    # Argon2 runs in this pool, at most PASSWORD_HASH_MAX_CONCURRENCY hashes at once
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = max(1, (os.cpu_count() or 1) // 2)
+    PASSWORD_HASH_MAX_CONCURRENCY: int | None = None
+    # hashes waiting beyond this are refused with a 503, None queues them all
+    PASSWORD_HASH_MAX_QUEUE: int | None = 32
+    # Argon2 parameters, see `appcli calibrate-hash`
+    PASSWORD_HASH_TIME_COST: int = 3
+    PASSWORD_HASH_MEMORY_COST: int = 65536  # KiB
+    PASSWORD_HASH_PARALLELISM: int = 4
+
+    # tasks are published from a thread, at most TASK_PUBLISHER_MAX_QUEUE wait for it
+    TASK_PUBLISHER_MAX_QUEUE: int = 10_000
+    TASK_PUBLISHER_BATCH_SIZE: int = 100
+    # tasks are written to the outbox table and published by `appcli relay-outbox`
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    # the relay logs the queue depth and publish latency of the publisher this often
+    OUTBOX_STATS_SECONDS: float = 60
 
     CELERY_BROKER_SERVER: str
     CELERY_BROKER_USER: str = "guest"
     CELERY_BROKER_PASSWORD: str = "guest"
     CELERY_BROKER_PORT: int = 5672
     CELERY_BROKER_VHOST: str = ""
+    # "disabled" stores no task results, "database" stores them in
+    # CELERY_RESULT_DATABASE_URL, "rpc" sends them back to the caller through the broker
+    CELERY_RESULTS: Literal["disabled", "database", "rpc"] = "disabled"
+    # e.g. db+postgresql+psycopg://..., defaults to the app database
+    CELERY_RESULT_DATABASE_URL: str | None = None
+    # stored results are purged in batches by `purge_task_results` once expired
+    CELERY_RESULT_EXPIRES_HOURS: float = 24
+    CELERY_RESULT_PURGE_BATCH_SIZE: int = 1000
+    CELERY_RESULT_PURGE_INTERVAL_MINUTES: float = 60
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -123,7 +199,13 @@ class Settings(BaseSettings):
 
     @computed_field  # type: ignore[prop-decorator]
     @property
-    def CELERY_RESULT_BACKEND(self) -> CeleryBackendUrl:
+    def CELERY_RESULT_BACKEND(self) -> str | None:
+        if self.CELERY_RESULTS == "disabled":
+            return None
+        if self.CELERY_RESULTS == "rpc":
+            return "rpc://"
+        if self.CELERY_RESULT_DATABASE_URL:
+            return self.CELERY_RESULT_DATABASE_URL
         return MultiHostUrl.build(
             scheme="db+postgresql+psycopg",
             username=self.POSTGRES_USER,
@@ -131,7 +213,7 @@ class Settings(BaseSettings):
             host=self.POSTGRES_SERVER,
             port=self.POSTGRES_PORT,
             path=self.POSTGRES_DB,
-        )
+        ).unicode_string()
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -1,11 +1,49 @@
+from datetime import timedelta
+
 from celery import Celery  # type: ignore
+from celery.signals import worker_process_init, worker_process_shutdown  # type: ignore
 
 from app.config import settings
+from app.email.rendering import preload_templates
+from app.email.smtp import close_smtp_pool, init_smtp_pool
 
 app = Celery(
     "app",
     broker=settings.CELERY_BROKER_URL.unicode_string(),
-    backend=settings.CELERY_RESULT_BACKEND.unicode_string(),
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.task_results"],
 )
 
+# publishes wait for the broker to confirm them, see app/outbox/publisher.py
+app.conf.broker_transport_options = {"confirm_publish": True}
+
+# tasks that need their result opt in with ignore_result=False
+app.conf.task_ignore_result = settings.CELERY_RESULTS == "disabled"
+# None stops beat from scheduling celery.backend_cleanup, a single unbatched DELETE,
+# expired database results are purged by purge_task_results instead
+app.conf.result_expires = None
+app.conf.beat_schedule = {
+    "purge-task-results": {
+        "task": "app.task_results.purge_task_results",
+        "schedule": timedelta(minutes=settings.CELERY_RESULT_PURGE_INTERVAL_MINUTES),
+    },
+}
+
 app.autodiscover_tasks(["app.users"])
+
+
+@worker_process_init.connect  # type: ignore[misc]
+def preload_email_templates(**kwargs: object) -> None:
+    # compiled once per worker process instead of on the first email of each
+    preload_templates()
+
+
+@worker_process_init.connect  # type: ignore[misc]
+def open_smtp_pool(**kwargs: object) -> None:
+    # after the fork, so every worker process has connections of its own
+    init_smtp_pool()
+
+
+@worker_process_shutdown.connect  # type: ignore[misc]
+def close_smtp_connections(**kwargs: object) -> None:
+    close_smtp_pool()
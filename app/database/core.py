@@ -1,17 +1,54 @@
+from itertools import cycle
+
 from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 from app.config import settings
 
-async_engine = create_async_engine(
-    url=settings.SQLALCHEMY_DATABASE_URI.unicode_string(),
+from .pool import InstrumentedPool, instrument_pool
+from .routing import RoutingSession
+
+
+def create_pooled_engine(url: str, name: str) -> AsyncEngine:
+    """Creates an engine with the pool configured in settings and instrumented under `name`."""
+    engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+    )
+    instrument_pool(engine)
+    return engine
+
+
+async_engine = create_pooled_engine(
+    url=settings.SQLALCHEMY_DATABASE_URI.unicode_string(), name="primary"
 )
 
+replica_engines = [
+    create_pooled_engine(url=str(uri), name=f"replica_{index}")
+    for index, uri in enumerate(settings.POSTGRES_REPLICA_URIS)
+]
+
+engines = {
+    "primary": async_engine,
+    **{f"replica_{index}": engine for index, engine in enumerate(replica_engines)},
+}
+
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     autocommit=False,
     expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    replicas=cycle([engine.sync_engine for engine in replica_engines])
+    if replica_engines
+    else None,
+    read_your_writes=settings.POSTGRES_READ_YOUR_WRITES,
 )
 
 
@@ -1,14 +1,54 @@
-from typing import Annotated, AsyncGenerator
+from functools import cache
+from typing import Annotated, Any, AsyncGenerator, Awaitable, Callable, cast
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from app.repository import BaseRepository
+from app.schema import serialized_fields
+
 from .core import AsyncSessionLocal
+from .unit_of_work import RELEASE_AFTER_READ_KEY
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    The session only checks out a connection when it runs its first statement, and
+    returns it to the pool after every read, see `release_after_read`. Handlers that
+    never touch the database or fail validation never hold a connection
+    """
     async with AsyncSessionLocal() as session:
+        session.info[RELEASE_AFTER_READ_KEY] = True
         yield session
 
 
 DbSession = Annotated[AsyncSession, Depends(get_session)]
+
+
+@cache
+def _response_columns(
+    repository: type[BaseRepository[Any]], response_model: type[BaseModel]
+) -> tuple[str, ...]:
+    return repository.columns_for(serialized_fields(response_model))
+
+
+def response_columns(
+    repository: type[BaseRepository[Any]],
+) -> Callable[[Request], Awaitable[tuple[str, ...] | None]]:
+    """
+    Dependency of the columns of `repository` the route's `response_model` serializes, pass
+    them as `columns` so only those are loaded. None, every column, if the route doesn't
+    respond with a pydantic model
+    """
+
+    async def get_response_columns(request: Request) -> tuple[str, ...] | None:
+        response_model = cast(APIRoute, request.scope["route"]).response_model
+        if not (
+            isinstance(response_model, type) and issubclass(response_model, BaseModel)
+        ):
+            return None
+        return _response_columns(repository, response_model)
+
+    return get_response_columns
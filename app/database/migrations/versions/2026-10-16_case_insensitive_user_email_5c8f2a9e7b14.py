@@ -0,0 +1,31 @@
+"""case insensitive user email
+
+Fails if emails differing only by case were already registered, merge or rename
+those accounts before upgrading.
+
+Revision ID: 5c8f2a9e7b14
+Revises: e7a3c91b5d20
+Create Date: 2026-10-16 17:05:12.408531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8f2a9e7b14'
+down_revision: Union[str, None] = 'e7a3c91b5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('uq_user_lower_email', 'user', [sa.text('lower(email)')], unique=True)
+    op.drop_constraint('uq_user_email', 'user', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('uq_user_email', 'user', ['email'])
+    op.drop_index('uq_user_lower_email', table_name='user')
@@ -0,0 +1,29 @@
+"""index celery date_done
+
+Revision ID: d3f7b2a9c615
+Revises: a1d6e8f3c402
+Create Date: 2026-10-16 21:04:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f7b2a9c615'
+down_revision: Union[str, None] = 'a1d6e8f3c402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # expired results are looked up by date_done, see app/task_results.py
+    op.create_index(op.f('ix_celery_taskmeta_date_done'), 'celery_taskmeta', ['date_done'], unique=False)
+    op.create_index(op.f('ix_celery_tasksetmeta_date_done'), 'celery_tasksetmeta', ['date_done'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_celery_tasksetmeta_date_done'), table_name='celery_tasksetmeta')
+    op.drop_index(op.f('ix_celery_taskmeta_date_done'), table_name='celery_taskmeta')
@@ -4,6 +4,7 @@ List of all the application models, mainly for alembic migrations but could be u
 
 from celery.backends.database.session import ResultModelBase  # type: ignore
 
+from app.outbox.models import OutboxMessage  # noqa: F401
 from app.users.models import Base as UserBase
 
 # used for multiple models
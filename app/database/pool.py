@@ -0,0 +1,73 @@
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Mapping
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+@dataclass
+class PoolMetrics:
+    """Counters of a connection pool, updated by its events and `InstrumentedPool`."""
+
+    checkouts: int = 0
+    checked_out: int = 0
+    timeouts: int = 0
+    checkout_seconds: float = 0.0
+    max_checkout_seconds: float = 0.0
+
+
+# keyed by the pool logging name, which survives pools being recreated on dispose
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording how long checkouts wait for a connection.
+
+    SQLAlchemy has no event before a checkout starts, so the wait is timed here.
+    The engine must be created with a `pool_logging_name`.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        metrics = pool_metrics.setdefault(self.logging_name or "", PoolMetrics())
+
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+
+        metrics.checkout_seconds += elapsed
+        metrics.max_checkout_seconds = max(metrics.max_checkout_seconds, elapsed)
+        return entry
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Keeps the checked out connections of the pool of `engine` up to date in `pool_metrics`."""
+    pool = engine.sync_engine.pool
+    metrics = pool_metrics.setdefault(pool.logging_name or "", PoolMetrics())
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(*args: Any) -> None:
+        metrics.checkouts += 1
+        metrics.checked_out += 1
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(*args: Any) -> None:
+        metrics.checked_out -= 1
+
+
+def pool_stats(engines: Mapping[str, AsyncEngine]) -> dict[str, dict[str, Any]]:
+    """Returns the metrics and current size and overflow of the pool of each engine."""
+    stats: dict[str, dict[str, Any]] = {}
+    for name, engine in engines.items():
+        pool = engine.sync_engine.pool
+        metrics = pool_metrics.get(pool.logging_name or "", PoolMetrics())
+        stats[name] = asdict(metrics)
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats[name]["size"] = pool.size()
+            stats[name]["overflow"] = pool.overflow()
+    return stats
@@ -0,0 +1,59 @@
+from typing import Any, Iterator
+
+from sqlalchemy import Connection, Engine, Select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+
+
+class RoutingSession(Session):
+    """Session sending plain SELECTs to a read replica and everything else to the primary.
+
+    A replica is picked round robin from `replicas` on the first read of the session
+    and kept for the rest of it. Flushes, INSERT/UPDATE/DELETE, `with_for_update()`
+    and any other statement run on the primary.
+
+    With `read_your_writes` the session is pinned to the primary after its first
+    write, so it never reads data older than what it just wrote. Without it reads keep
+    going to the replica and may not see the writes until they are replicated,
+    including the refresh done by `BaseRepository.create`.
+
+    Usage:
+    async_sessionmaker(
+        bind=primary_engine,
+        sync_session_class=RoutingSession,
+        replicas=itertools.cycle([engine.sync_engine for engine in replica_engines]),
+    )
+    """
+
+    def __init__(
+        self,
+        replicas: Iterator[Engine] | None = None,
+        read_your_writes: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.replicas = replicas
+        self.read_your_writes = read_your_writes
+        self.pinned_to_primary = False
+        self._replica: Engine | None = None
+
+    def get_bind(
+        self,
+        mapper: Any | None = None,
+        *,
+        clause: ClauseElement | None = None,
+        **kwargs: Any,
+    ) -> Engine | Connection:
+        if self.replicas is None or self.pinned_to_primary:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        if isinstance(clause, Select) and clause._for_update_arg is None:
+            if self._replica is None:
+                self._replica = next(self.replicas)
+            return self._replica
+
+        if self.read_your_writes and (
+            self._flushing or (clause is not None and clause.is_dml)
+        ):
+            self.pinned_to_primary = True
+        return super().get_bind(mapper, clause=clause, **kwargs)
@@ -0,0 +1,63 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEPTH_KEY = "unit_of_work_depth"
+RELEASE_AFTER_READ_KEY = "release_after_read"
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    return bool(session.info.get(DEPTH_KEY, 0))
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Groups every write made through `session` into a single transaction.
+
+    Inside the scope repositories flush instead of committing, the transaction is
+    committed once when the outermost scope exits, or rolled back if it raises.
+
+    Usage:
+    async with unit_of_work(session):
+        await UserRepository(session).create(...)
+        await UserRepository(session).update(...)
+    """
+    depth = session.info.get(DEPTH_KEY, 0)
+    session.info[DEPTH_KEY] = depth + 1
+    try:
+        yield session
+    except BaseException:
+        if depth == 0:
+            await session.rollback()
+        raise
+    else:
+        if depth == 0:
+            await session.commit()
+    finally:
+        session.info[DEPTH_KEY] = depth
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commits the session, or only flushes it when inside a unit of work."""
+    if in_unit_of_work(session):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+async def release_after_read(session: AsyncSession) -> None:
+    """Returns the connection of `session` to the pool once a read is done.
+
+    Only applies to sessions flagged with `RELEASE_AFTER_READ_KEY`, outside a unit of
+    work and without pending changes. The read only transaction is committed, loaded
+    instances stay usable as long as the session doesn't expire them on commit, and the
+    next statement checks out a connection again.
+    """
+    if (
+        session.info.get(RELEASE_AFTER_READ_KEY)
+        and session.in_transaction()
+        and not in_unit_of_work(session)
+        and not (session.new or session.dirty or session.deleted)
+    ):
+        await session.commit()
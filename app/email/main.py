@@ -3,13 +3,12 @@ Taken from https://github.com/fastapi/full-stack-fastapi-template/blob/ba1706b48
 """
 
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Any
 
 import emails  # type: ignore
-from jinja2 import Template
 
 from app.config import settings
+from app.email.rendering import render_email_template
+from app.email.smtp import get_smtp_pool
 from app.utils import get_logger
 
 logger = get_logger()
@@ -21,35 +20,29 @@ class EmailData:
     subject: str
 
 
-def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
-
-
 def send_email(
     html: str = "",
     subject: str = "",
     email_to: str = "",
 ) -> None:
+    """Sends an email over a connection of the SMTP pool of this process.
+
+    Raises:
+        smtplib.SMTPException: Raised if the server refused the email.
+        OSError: Raised if the server can't be reached.
+    """
     message = emails.Message(
         subject=subject,
         html=html,
         mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+        mail_to=email_to,
+    )
+    get_smtp_pool().send(
+        from_addr=str(settings.EMAILS_FROM_EMAIL),
+        to_addrs=[email_to],
+        message=message.as_string(),
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logger.info(f"send email result: {response}")
+    logger.info(f"sent email to {email_to}")
 
 
 def generate_test_email(email_to: str) -> EmailData:
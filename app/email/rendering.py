@@ -0,0 +1,88 @@
+import subprocess
+from pathlib import Path
+from typing import Any, Sequence
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
+
+from app.config import settings
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+SOURCE_DIR = TEMPLATES_DIR / "src"
+BUILD_DIR = TEMPLATES_DIR / "build"
+
+DEFAULT_MJML_COMMAND = ("npx", "--yes", "mjml")
+
+
+def create_environment(
+    template_dir: Path = BUILD_DIR, bytecode_cache_dir: Path | None = None
+) -> Environment:
+    """Returns a Jinja environment loading the built HTML templates.
+
+    Compiled templates are kept in memory and never checked for changes again, the
+    bytecode is cached on disk so new workers don't parse the templates either.
+    `bytecode_cache_dir` defaults to a directory in the system temp dir.
+    """
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=FileSystemBytecodeCache(
+            str(bytecode_cache_dir) if bytecode_cache_dir else None
+        ),
+        autoescape=select_autoescape(["html"]),
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+environment = create_environment(bytecode_cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR)
+
+
+def preload_templates(env: Environment = environment) -> list[str]:
+    """Compiles every template up front, so no email waits on reading one."""
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
+    return environment.get_template(template_name).render(context)
+
+
+def build_templates(
+    mjml_command: Sequence[str] = DEFAULT_MJML_COMMAND,
+    source_dir: Path = SOURCE_DIR,
+    build_dir: Path = BUILD_DIR,
+) -> list[Path]:
+    """Compiles the MJML sources into the HTML templates emails are rendered from.
+
+    Args:
+        mjml_command (Sequence[str], optional): The MJML CLI. Defaults to DEFAULT_MJML_COMMAND.
+        source_dir (Path, optional): Directory of the `.mjml` sources. Defaults to SOURCE_DIR.
+        build_dir (Path, optional): Directory the `.html` templates are written to. Defaults to BUILD_DIR.
+
+    Raises:
+        subprocess.CalledProcessError: Raised if MJML fails to compile a source.
+
+    Returns:
+        list[Path]: The built templates.
+    """
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    built = []
+    for source in sorted(source_dir.glob("*.mjml")):
+        output = build_dir / f"{source.stem}.html"
+        subprocess.run(
+            [*mjml_command, str(source), "-o", str(output)],
+            check=True,
+            capture_output=True,
+        )
+        built.append(output)
+    return built
@@ -0,0 +1,186 @@
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from app.config import settings
+from app.utils import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class PooledConnection:
+    smtp: smtplib.SMTP
+    messages: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    """Keeps SMTP connections open between sends, so each email doesn't pay for a
+    new TCP and TLS handshake and AUTH.
+
+    At most `max_size` connections are open at once, a connection is closed after
+    `max_messages` messages since servers limit them per session. A connection idle
+    for more than `keepalive_seconds` is checked with NOOP before it's reused and
+    replaced if the server dropped it. Create the pool after forking, sockets can't
+    be shared between processes, Celery workers do it on `worker_process_init`.
+
+    Usage:
+    with smtp_pool.connection() as smtp:
+        smtp.sendmail(from_addr, [to_addr], message)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        tls: bool = False,
+        ssl: bool = False,
+        user: str | None = None,
+        password: str | None = None,
+        max_size: int = 1,
+        max_messages: int = 100,
+        keepalive_seconds: float = 30,
+        timeout: float = 10,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self.ssl = ssl
+        self.user = user
+        self.password = password
+        self.max_size = max_size
+        self.max_messages = max_messages
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[PooledConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """Checks a connection out of the pool, blocks while `max_size` are in use.
+
+        The connection is closed instead of returned to the pool if the block raises,
+        its state is unknown then, unless the recipients were refused.
+        """
+        with self._slots:
+            pooled = self._checkout()
+            try:
+                yield pooled.smtp
+            except smtplib.SMTPRecipientsRefused:
+                # smtplib reset the transaction, the connection is still usable
+                self._release(pooled)
+                raise
+            except Exception:
+                self._close(pooled)
+                raise
+            self._release(pooled)
+
+    def send(self, from_addr: str, to_addrs: list[str], message: str) -> None:
+        """Sends a message, retried once on a new connection if the server had
+        dropped the one from the pool.
+
+        Raises:
+            smtplib.SMTPException: Raised if the server refused the message.
+            OSError: Raised if the server can't be reached.
+        """
+        try:
+            with self.connection() as smtp:
+                smtp.sendmail(from_addr, to_addrs, message)
+        except smtplib.SMTPServerDisconnected:
+            logger.info("SMTP server closed the connection, sending again")
+            with self.connection() as smtp:
+                smtp.sendmail(from_addr, to_addrs, message)
+
+    def close(self) -> None:
+        """Closes the idle connections."""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def _checkout(self) -> PooledConnection:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return PooledConnection(smtp=self._connect())
+
+            if time.monotonic() - pooled.last_used < self.keepalive_seconds:
+                return pooled
+            try:
+                code, _ = pooled.smtp.noop()
+            except (smtplib.SMTPException, OSError):
+                code = None
+            if code == 250:
+                return pooled
+            logger.info("Idle SMTP connection dropped, reconnecting")
+            self._close(pooled)
+
+    def _release(self, pooled: PooledConnection) -> None:
+        pooled.messages += 1
+        pooled.last_used = time.monotonic()
+        if pooled.messages >= self.max_messages:
+            self._close(pooled)
+        else:
+            self._idle.put(pooled)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class: Callable[..., smtplib.SMTP] = (
+            smtplib.SMTP_SSL if self.ssl else smtplib.SMTP
+        )
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def _close(self, pooled: PooledConnection) -> None:
+        try:
+            pooled.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pooled.smtp.close()
+
+
+_smtp_pool: SMTPConnectionPool | None = None
+
+
+def init_smtp_pool() -> SMTPConnectionPool:
+    """Creates the pool of this process from the settings, closing the previous one."""
+    global _smtp_pool
+
+    if _smtp_pool is not None:
+        _smtp_pool.close()
+    _smtp_pool = SMTPConnectionPool(
+        host=settings.SMTP_HOST or "localhost",
+        port=settings.SMTP_PORT,
+        tls=settings.SMTP_TLS,
+        ssl=settings.SMTP_SSL,
+        user=settings.SMTP_USER,
+        password=settings.SMTP_PASSWORD,
+        max_size=settings.SMTP_POOL_SIZE,
+        max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+        keepalive_seconds=settings.SMTP_KEEPALIVE_SECONDS,
+        timeout=settings.SMTP_TIMEOUT,
+    )
+    return _smtp_pool
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Returns the pool of this process, created on first use outside of workers."""
+    return _smtp_pool or init_smtp_pool()
+
+
+def close_smtp_pool() -> None:
+    if _smtp_pool is not None:
+        _smtp_pool.close()
@@ -9,6 +9,8 @@ from app.schema import DefaultModel
 from app.utils import get_current_time
 
 ALGORITHM = "HS256"
+# tells email tokens apart from access tokens, both are signed with SECRET_KEY
+TOKEN_TYPE = "email"
 
 
 class Email(DefaultModel):
@@ -21,13 +23,27 @@ class EmailStatus(DefaultModel):
     error: str | None = None
 
 
+class BulkEmail(DefaultModel):
+    """A chunk of a bulk email, `template_name` is rendered for each recipient."""
+
+    recipients: list[EmailStr]
+    subject: str
+    template_name: str
+    context: dict[str, Any] = {}
+
+
+class BulkEmailStatus(DefaultModel):
+    sent: int
+    failed: list[EmailStatus]
+
+
 def generate_email_token(email: str) -> str:
     delta = timedelta(hours=settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS)
     now = get_current_time()
     expires = now + delta
     exp = expires.timestamp()
     encoded_jwt = jwt.encode(
-        {"exp": exp, "nbf": now, "sub": email},
+        {"exp": exp, "nbf": now, "sub": email, "type": TOKEN_TYPE},
         settings.SECRET_KEY,
         algorithm=ALGORITHM,
     )
@@ -37,6 +53,10 @@ def generate_email_token(email: str) -> str:
 def decode_email_token(token: str) -> Any:
     try:
         # automatically validates "exp" and "nbf"
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.InvalidTokenError:
         return None
+    # access tokens can't activate accounts or reset passwords
+    if payload.get("type") != TOKEN_TYPE:
+        return None
+    return payload
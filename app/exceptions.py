@@ -1,3 +1,4 @@
+import math
 from typing import Any
 
 from fastapi import HTTPException, status
@@ -31,3 +32,20 @@ class NotAuthenticated(DetailedHTTPException):
 
     def __init__(self) -> None:
         super().__init__(headers={"WWW-Authenticate": "Bearer"})
+
+
+class TooManyRequests(DetailedHTTPException):
+    STATUS_CODE = status.HTTP_429_TOO_MANY_REQUESTS
+    DETAIL = "Too many requests"
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(headers={"Retry-After": str(math.ceil(retry_after))})
+
+
+class ServiceUnavailable(DetailedHTTPException):
+    STATUS_CODE = status.HTTP_503_SERVICE_UNAVAILABLE
+    DETAIL = "Service unavailable"
+
+
+class InvalidCursor(BadRequest):
+    DETAIL = "Invalid pagination cursor."
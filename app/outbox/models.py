@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.core import Base
+from app.utils import get_current_time
+
+
+class OutboxMessage(Base):
+    """A Celery task to publish, written in the transaction of the change it's about."""
+
+    __tablename__ = "outbox_message"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task: Mapped[str]
+    kwargs: Mapped[dict[str, Any]] = mapped_column(JSON)
+    # the relay skips the message until then, pushed back after each failed publish
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=get_current_time, index=True
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str | None]
@@ -0,0 +1,155 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from app.config import settings
+from app.config_celery import app as celery_app
+
+Message = tuple[str, dict[str, Any], float, "Future[None]"]
+
+
+class PublisherBusy(Exception):
+    """Raised when the buffer of `TaskPublisher` is full, the broker can't keep up."""
+
+
+@dataclass
+class PublisherMetrics:
+    published: int = 0
+    failed: int = 0
+    rejected: int = 0
+    # from submitting to the broker confirming, waiting in the buffer included
+    publish_seconds: float = 0
+    max_publish_seconds: float = 0
+
+
+class TaskPublisher:
+    """Publishes Celery tasks from a dedicated thread, never from the event loop.
+
+    Messages wait in a buffer of `max_queue` messages, the thread publishes up to
+    `batch_size` of them at a time through one producer it keeps for its lifetime,
+    so the connection and channel are reused. With `confirm_publish` the broker
+    confirms each message before its future resolves. When the buffer is full new
+    messages are refused with `PublisherBusy` straight away instead of piling up.
+
+    Usage:
+    await task_publisher.publish(send_new_user_email.name, {"email": {...}})
+    """
+
+    def __init__(
+        self,
+        max_queue: int,
+        batch_size: int,
+        send: Callable[[str, dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.metrics = PublisherMetrics()
+        self._send = send or self._send_task
+        # only used by the publisher thread
+        self._producer: Any = None
+        self._queue: queue.Queue[Message | None] = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, task: str, kwargs: dict[str, Any]) -> "Future[None]":
+        """Buffers a message, the future resolves once it's published."""
+        self._start()
+
+        future: Future[None] = Future()
+        try:
+            self._queue.put_nowait((task, kwargs, time.perf_counter(), future))
+        except queue.Full:
+            self.metrics.rejected += 1
+            future.set_exception(PublisherBusy(f"{self.max_queue} messages waiting"))
+        return future
+
+    async def publish(self, task: str, kwargs: dict[str, Any]) -> None:
+        """
+        Raises:
+            PublisherBusy: Raised if the buffer is full.
+            Exception: Raised if the broker didn't accept the message.
+        """
+        await asyncio.wrap_future(self.submit(task, kwargs))
+
+    def stats(self) -> dict[str, Any]:
+        published = self.metrics.published
+        return {
+            "queued": self._queue.qsize(),
+            **asdict(self.metrics),
+            "avg_publish_seconds": (
+                self.metrics.publish_seconds / published if published else 0
+            ),
+        }
+
+    def close(self, timeout: float | None = None) -> None:
+        """Publishes the buffered messages and stops the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="task-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for message in batch:
+                if message is None:
+                    stopping = True
+                    continue
+
+                task, kwargs, submitted_at, future = message
+                try:
+                    self._send(task, kwargs)
+                except Exception as e:
+                    self.metrics.failed += 1
+                    future.set_exception(e)
+                    # the connection may be broken, start over with a new one
+                    self._release_producer()
+                    continue
+
+                elapsed = time.perf_counter() - submitted_at
+                self.metrics.published += 1
+                self.metrics.publish_seconds += elapsed
+                self.metrics.max_publish_seconds = max(
+                    self.metrics.max_publish_seconds, elapsed
+                )
+                future.set_result(None)
+
+        self._release_producer()
+
+    def _send_task(self, task: str, kwargs: dict[str, Any]) -> None:
+        if self._producer is None:
+            self._producer = celery_app.producer_pool.acquire(block=True)
+        celery_app.send_task(task, kwargs=kwargs, producer=self._producer)
+
+    def _release_producer(self) -> None:
+        if self._producer is not None:
+            self._producer.release()
+            self._producer = None
+
+
+task_publisher = TaskPublisher(
+    max_queue=settings.TASK_PUBLISHER_MAX_QUEUE,
+    batch_size=settings.TASK_PUBLISHER_BATCH_SIZE,
+)
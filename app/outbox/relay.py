@@ -0,0 +1,124 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.unit_of_work import unit_of_work
+from app.utils import get_current_time, get_logger
+
+from .publisher import task_publisher
+from .repository import OutboxRepository
+
+logger = get_logger()
+
+# seconds before retrying a failed publish, doubled on each attempt
+RETRY_BACKOFF_SECONDS = 2
+MAX_RETRY_BACKOFF_SECONDS = 300
+
+Publish = Callable[[str, dict[str, Any]], Awaitable[None]]
+Stats = Callable[[], dict[str, Any]]
+
+
+async def enqueue_task(session: AsyncSession, task: Any, **kwargs: Any) -> None:
+    """Schedules a Celery task once the transaction of `session` commits.
+
+    Nothing is sent to the broker, `OutboxRelay` publishes the task later, so it's
+    only sent if the change it's about is committed and the request never waits on
+    the broker. Call it inside the unit of work of that change.
+
+    Usage:
+    async with unit_of_work(session):
+        user = await UserRepository(session).create(...)
+        await enqueue_task(session, send_new_user_email, email={"email": user.email})
+    """
+    await OutboxRepository(session).add(task=task.name, kwargs=kwargs)
+
+
+class OutboxRelay:
+    """Publishes the messages of the outbox to Celery in batches.
+
+    Each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several relays can
+    run at once. Published messages are deleted in the transaction that claimed
+    them, failed ones are retried with an exponential backoff until `max_attempts`,
+    then left in the table for inspection. A message can be published twice if the
+    relay dies between publishing and committing, tasks must tolerate it.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        max_attempts: int,
+        publish: Publish = task_publisher.publish,
+        stats: Stats = task_publisher.stats,
+    ) -> None:
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.publish = publish
+        self.stats = stats
+
+    async def relay_batch(self, session: AsyncSession) -> int:
+        """Publishes a batch of due messages, returns how many were claimed."""
+        repository = OutboxRepository(session)
+        async with unit_of_work(session):
+            messages = await repository.claim(self.batch_size, self.max_attempts)
+
+            # handed to the publisher thread at once, the broker confirms each message
+            results = await asyncio.gather(
+                *(self.publish(message.task, message.kwargs) for message in messages),
+                return_exceptions=True,
+            )
+
+            published = []
+            for message, result in zip(messages, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Could not publish {message.task}: {result}")
+                    backoff = min(
+                        RETRY_BACKOFF_SECONDS * 2**message.attempts,
+                        MAX_RETRY_BACKOFF_SECONDS,
+                    )
+                    await repository.retry_later(
+                        message,
+                        available_at=get_current_time() + timedelta(seconds=backoff),
+                        error=str(result),
+                    )
+                else:
+                    published.append(message.id)
+
+            if published:
+                await repository.delete_published(published)
+        return len(messages)
+
+    async def run(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        poll_interval: float,
+        stats_interval: float,
+    ) -> None:
+        """Relays forever, full batches are followed by the next one straight away.
+
+        The publisher stats, its queue depth and publish latency, are logged every
+        `stats_interval` seconds.
+        """
+        next_stats = time.monotonic() + stats_interval
+        while True:
+            try:
+                async with session_factory() as session:
+                    claimed = await self.relay_batch(session)
+            except Exception as e:
+                logger.exception(e)
+                claimed = 0
+
+            if time.monotonic() >= next_stats:
+                logger.info(f"Publisher stats: {self.stats()}")
+                next_stats = time.monotonic() + stats_interval
+
+            if claimed < self.batch_size:
+                await asyncio.sleep(poll_interval)
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.OUTBOX_BATCH_SIZE, max_attempts=settings.OUTBOX_MAX_ATTEMPTS
+)
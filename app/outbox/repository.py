@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import delete, select
+
+from app.database.unit_of_work import commit
+from app.repository import BaseRepository
+from app.utils import get_current_time
+
+from .models import OutboxMessage
+
+
+class OutboxRepository(BaseRepository[OutboxMessage]):
+    model = OutboxMessage
+
+    async def add(self, task: str, kwargs: dict[str, Any]) -> None:
+        """Adds a message, call it inside the unit of work of the change it's about."""
+        self.session.add(self.model(task=task, kwargs=kwargs))
+        await commit(self.session)
+
+    async def claim(self, limit: int, max_attempts: int) -> Sequence[OutboxMessage]:
+        """Locks the oldest messages due for publishing until the transaction ends.
+
+        Locked rows are skipped, so concurrent relays claim different messages.
+        """
+        statement = (
+            select(self.model)
+            .where(
+                self.model.available_at <= get_current_time(),
+                self.model.attempts < max_attempts,
+            )
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.scalars(statement)
+        return result.all()
+
+    async def delete_published(self, ids: Sequence[int]) -> None:
+        await self.session.execute(delete(self.model).where(self.model.id.in_(ids)))
+        await commit(self.session)
+
+    async def retry_later(
+        self, message: OutboxMessage, available_at: datetime, error: str
+    ) -> None:
+        message.attempts += 1
+        message.available_at = available_at
+        message.last_error = error
+        await commit(self.session)
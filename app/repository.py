@@ -1,16 +1,162 @@
+import base64
+import json
 from abc import ABC
-from typing import Generic, Mapping, Sequence, TypeVar
-
-from sqlalchemy import select
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import batched
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Generic,
+    Iterable,
+    Mapping,
+    Sequence,
+    TypeVar,
+    cast,
+)
+from uuid import UUID
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Table,
+    UniqueConstraint,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, load_only
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.database.core import Base
+from app.database.unit_of_work import (
+    commit,
+    in_unit_of_work,
+    release_after_read,
+    unit_of_work,
+)
 
 SAModel = TypeVar("SAModel", bound=Base)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_YIELD_PER = 1000
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class Page(Generic[SAModel]):
+    """A page of results and the cursor pointing to the next one, if any."""
+
+    items: Sequence[SAModel]
+    next_cursor: str | None = None
+
+
+# python types of the columns a cursor can hold, the others don't round trip through JSON
+JSON_CURSOR_TYPES: tuple[type, ...] = (int, float, str, bool)
+TEXT_CURSOR_TYPES: tuple[type, ...] = (datetime, date, time, Decimal, UUID)
+
+
+def _cursor_value(value: object) -> object:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+def parse_cursor_value(value: object, python_type: type) -> object:
+    """Converts a value decoded from a cursor back to the type of its column.
+
+    Raises:
+        ValueError: Raised if the value isn't one of the column.
+    """
+    if value is None or python_type not in TEXT_CURSOR_TYPES:
+        return value
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor.")
+    try:
+        if python_type in (datetime, date, time):
+            return cast(type[date], python_type).fromisoformat(value)
+        return python_type(value)
+    except (ValueError, InvalidOperation):
+        raise ValueError("Invalid cursor.")
+
+
+def encode_cursor(order_by: str, values: Sequence[object]) -> str:
+    """Encodes the keyset of the last row of a page into an opaque cursor.
+
+    Dates, times, decimals and UUIDs are stored as text, see `parse_cursor_value`.
+    """
+    raw = json.dumps(
+        {"k": order_by, "v": [_cursor_value(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> list[object]:
+    """Decodes a cursor created by `encode_cursor`.
+
+    Raises:
+        ValueError: Raised if the cursor is malformed or was created for a different ordering.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except ValueError:
+        raise ValueError("Invalid cursor.")
+
+    if (
+        not isinstance(data, dict)
+        or data.get("k") != order_by
+        or not isinstance(data.get("v"), list)
+    ):
+        raise ValueError("Invalid cursor.")
+
+    values: list[object] = data["v"]
+    return values
+
+
+def _indexed_keys(table: Table) -> frozenset[str]:
+    """Returns the columns that lead an index, the ones keyset pagination can seek by."""
+    leading_columns = [list(index.expressions)[0] for index in table.indexes] + [
+        list(constraint.columns)[0]
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint) and constraint.columns
+    ]
+    return frozenset(
+        column.key
+        for column in table.columns
+        if column.primary_key
+        or column.unique
+        or column.index
+        or any(leading is column for leading in leading_columns)
+    )
+
 
 class BaseRepository(ABC, Generic[SAModel]):
     model: type[SAModel]
+    # compared through lower(), back them with a unique index on lower(column)
+    case_insensitive_keys: ClassVar[frozenset[str]] = frozenset()
+
+    # computed once per subclass by __init_subclass__
+    _column_keys: frozenset[str]
+    _indexed_keys: frozenset[str]
+    _statements: dict[
+        tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]],
+        Select[tuple[SAModel]],
+    ]
 
     def __init__(self, session: AsyncSession):
         """
@@ -24,8 +170,24 @@ class BaseRepository(ABC, Generic[SAModel]):
         """
         self.session = session
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        cls._statements = {}
+        if "model" in cls.__dict__:
+            table = cast(Table, cls.model.__table__)
+            cls._column_keys = frozenset(column.key for column in table.columns)
+            cls._indexed_keys = _indexed_keys(table)
+
+    def unit_of_work(self) -> AbstractAsyncContextManager[AsyncSession]:
+        """Defers the commits of the repository until the returned scope exits.
+
+        See `app.database.unit_of_work.unit_of_work`.
+        """
+        return unit_of_work(self.session)
+
     def _validate_keys(self, kwargs: Mapping[str, object]) -> None:
-        valid_keys = {attr.key for attr in self.model.__table__.columns}
+        valid_keys = self._column_keys
         invalid_keys = [key for key in kwargs.keys() if key not in valid_keys]
 
         if invalid_keys:
@@ -33,48 +195,253 @@ class BaseRepository(ABC, Generic[SAModel]):
                 f"Invalid attribute(s) for {self.model.__name__}: {', '.join(invalid_keys)}"
             )
 
-    async def get(self, model_id: int | None) -> SAModel | None:
-        statement = select(self.model)
+    def _key_expression(self, key: str) -> ColumnElement[Any]:
+        """Returns the column `key`, or lower(column) if it's case insensitive."""
+        column = cast(ColumnElement[Any], getattr(self.model, key))
+        if key in self.case_insensitive_keys:
+            return func.lower(column)
+        return column
+
+    def _match(self, key: str, value: object) -> ColumnElement[bool]:
+        if value is None:
+            # NULL never equals anything, lower(NULL) included
+            return cast(ColumnElement[Any], getattr(self.model, key)).is_(None)
+        if key in self.case_insensitive_keys:
+            # lowered on both sides so the lower(column) index is used
+            return self._key_expression(key) == func.lower(value)
+        return cast(ColumnElement[Any], getattr(self.model, key)) == value
+
+    def _criteria(self, kwargs: Mapping[str, object]) -> list[ColumnElement[bool]]:
+        return [
+            self._match(attribute_key, value) for attribute_key, value in kwargs.items()
+        ]
+
+    @classmethod
+    def columns_for(cls, fields: Iterable[str]) -> tuple[str, ...]:
+        """Returns which of `fields` are columns of the model, e.g. the fields of a response model."""
+        return tuple(sorted(cls._column_keys.intersection(fields)))
+
+    def _projection(self, columns: Iterable[str] | None) -> tuple[str, ...]:
+        if columns is None:
+            return ()
+
+        projection = tuple(sorted(set(columns)))
+        self._validate_keys(dict.fromkeys(projection))
+        return projection
+
+    def _select_by(
+        self,
+        keys: tuple[str, ...],
+        columns: tuple[str, ...] = (),
+        null_keys: tuple[str, ...] = (),
+    ) -> Select[tuple[SAModel]]:
+        """Returns a SELECT filtering by `keys` through bound parameters named after them,
+        and by `null_keys` being NULL.
+
+        Statements are cached per subclass, so lookups with the same attribute names
+        reuse the same statement instead of rebuilding it, which also means
+        SQLAlchemy's compiled cache is hit every time. `keys` and `null_keys` must be
+        sorted.
+
+        When `columns` is given only those columns (and the primary key) are loaded,
+        accessing any other attribute of the instances will fail.
+        """
+        cache_key = (keys, columns, null_keys)
+        statement = self._statements.get(cache_key)
+        if statement is None:
+            statement = select(self.model).where(
+                *(self._match(key, bindparam(key)) for key in keys),
+                *(self._match(key, None) for key in null_keys),
+            )
+            if columns:
+                statement = statement.options(
+                    load_only(*(getattr(self.model, column) for column in columns))
+                )
+            self._statements[cache_key] = statement
+        return statement
+
+    def _select_by_values(
+        self, kwargs: Mapping[str, object], columns: tuple[str, ...] = ()
+    ) -> tuple[Select[tuple[SAModel]], dict[str, object]]:
+        """Returns the cached SELECT filtering by `kwargs` and its parameters.
+
+        A None value is matched with IS NULL, bound as a parameter it would compare
+        `= NULL` and match nothing.
+        """
+        params = {key: value for key, value in kwargs.items() if value is not None}
+        null_keys = tuple(sorted(kwargs.keys() - params.keys()))
+        statement = self._select_by(tuple(sorted(params)), columns, null_keys)
+        return statement, params
 
-        if model_id is not None:
-            statement = statement.where(self.model.id == model_id)
+    def _keyset(self, order_by: str) -> tuple[InstrumentedAttribute[Any], ...]:
+        """Returns the columns a keyset paginated query is sorted by.
 
-        result = await self.session.scalars(statement)
+        `id` is appended as a tie breaker to other columns so the ordering is total.
+
+        Raises:
+            AttributeError: Raised if `order_by` isn't a column of the model.
+            ValueError: Raised if `order_by` isn't an indexed column.
+        """
+        self._validate_keys({order_by: None})
 
-        return result.first()
+        if order_by not in self._indexed_keys:
+            raise ValueError(
+                f"Cannot paginate {self.model.__name__} by non indexed column {order_by}"
+            )
 
-    async def get_all(self) -> Sequence[SAModel]:
-        statement = select(self.model)
+        if order_by == "id":
+            return (self.model.id,)
 
-        result = await self.session.scalars(statement)
+        attribute: InstrumentedAttribute[Any] = getattr(self.model, order_by)
+        try:
+            python_type = attribute.type.python_type
+        except NotImplementedError:
+            python_type = object
+        if python_type not in JSON_CURSOR_TYPES + TEXT_CURSOR_TYPES:
+            raise ValueError(
+                f"Cannot paginate {self.model.__name__} by {order_by}, "
+                f"{attribute.type} values can't be stored in a cursor"
+            )
+        return (attribute, self.model.id)
 
-        return result.all()
+    async def get(
+        self, model_id: int | None, columns: Iterable[str] | None = None
+    ) -> SAModel | None:
+        if model_id is None:
+            return await self.get_by_attributes(columns=columns)
 
-    async def get_by_attributes(self, **kwargs: object) -> SAModel | None:
-        self._validate_keys(kwargs)
+        return await self.get_by_attributes(columns=columns, id=model_id)
 
-        statement = select(self.model)
+    async def get_all(self, columns: Iterable[str] | None = None) -> Sequence[SAModel]:
+        return await self.get_all_by_attributes(columns=columns)
 
-        for attribute_key in kwargs:
-            model_attribute = getattr(self.model, attribute_key)
-            statement = statement.where(model_attribute == kwargs[attribute_key])
+    async def get_by_attributes(
+        self, columns: Iterable[str] | None = None, **kwargs: object
+    ) -> SAModel | None:
+        self._validate_keys(kwargs)
 
-        result = await self.session.scalars(statement)
+        statement, params = self._select_by_values(kwargs, self._projection(columns))
 
-        return result.first()
+        result = await self.session.scalars(statement, params)
+        instance = result.first()
+
+        await release_after_read(self.session)
+        return instance
 
     async def get_all_by_attributes(
-        self, **kwargs: Mapping[str, object]
+        self, columns: Iterable[str] | None = None, **kwargs: object
     ) -> Sequence[SAModel]:
         self._validate_keys(kwargs)
 
-        statement = select(self.model)
-        for attribute_key in kwargs:
-            model_attribute = getattr(self.model, attribute_key)
-            statement = statement.where(model_attribute == kwargs[attribute_key])
+        statement, params = self._select_by_values(kwargs, self._projection(columns))
 
-        result = await self.session.scalars(statement)
-        return result.all()
+        result = await self.session.scalars(statement, params)
+        instances = result.all()
+
+        await release_after_read(self.session)
+        return instances
+
+    async def get_page(
+        self,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        order_by: str = "id",
+        columns: Iterable[str] | None = None,
+        **kwargs: object,
+    ) -> Page[SAModel]:
+        """Fetches a page of instances using keyset (cursor) pagination.
+
+        Unlike OFFSET pagination, every page costs the same no matter how deep
+        it is, since the database seeks straight to the cursor through the index.
+
+        Args:
+            cursor (str | None, optional): `next_cursor` of the previous page. Defaults to None.
+            limit (int, optional): Page size, clamped to `MAX_PAGE_SIZE`. Defaults to DEFAULT_PAGE_SIZE.
+            order_by (str, optional): Indexed column to paginate by. Defaults to "id".
+            columns (Iterable[str] | None, optional): Only load these columns. Defaults to every column.
+            **kwargs: Attributes to filter by.
+
+        Raises:
+            ValueError: Raised if the cursor is invalid or `order_by` isn't indexed.
+
+        Returns:
+            Page[SAModel]: The instances and the cursor of the next page, None if it's the last one.
+        """
+        self._validate_keys(kwargs)
+        keyset = self._keyset(order_by)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        projection = self._projection(columns)
+        if projection:
+            # the keyset of the last instance is needed for the cursor
+            projection = self._projection([*projection, order_by])
+        statement, params = self._select_by_values(kwargs, projection)
+        if cursor is not None:
+            values = decode_cursor(cursor, order_by)
+            if len(values) != len(keyset):
+                raise ValueError("Invalid cursor.")
+            values = [
+                parse_cursor_value(value, attribute.type.python_type)
+                for attribute, value in zip(keyset, values)
+            ]
+            statement = statement.where(
+                tuple_(*keyset)
+                > tuple_(
+                    *(
+                        literal(value, attribute.type)
+                        for attribute, value in zip(keyset, values)
+                    )
+                )
+            )
+        statement = statement.order_by(*keyset).limit(limit + 1)
+
+        result = await self.session.scalars(statement, params)
+        items = result.all()
+        await release_after_read(self.session)
+
+        if len(items) <= limit:
+            return Page(items=items)
+
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            order_by, [getattr(last, attribute.key) for attribute in keyset]
+        )
+        return Page(items=items, next_cursor=next_cursor)
+
+    async def stream(
+        self,
+        yield_per: int = DEFAULT_YIELD_PER,
+        columns: Iterable[str] | None = None,
+        **kwargs: object,
+    ) -> AsyncIterator[SAModel]:
+        """Iterates over every matching instance without loading them all in memory.
+
+        Rows are fetched from a server side cursor `yield_per` at a time.
+        Wrap the iterator in `contextlib.aclosing` if it may not be exhausted.
+
+        Args:
+            yield_per (int, optional): Number of rows fetched per batch. Defaults to DEFAULT_YIELD_PER.
+            columns (Iterable[str] | None, optional): Only load these columns. Defaults to every column.
+            **kwargs: Attributes to filter by.
+
+        Yields:
+            SAModel: The matching instances ordered by id.
+        """
+        self._validate_keys(kwargs)
+
+        statement, params = self._select_by_values(kwargs, self._projection(columns))
+        statement = statement.order_by(self.model.id).execution_options(
+            yield_per=yield_per
+        )
+
+        result = await self.session.stream_scalars(statement, params)
+        try:
+            async for instance in result:
+                yield instance
+        finally:
+            await result.close()
+            await release_after_read(self.session)
 
     async def create(self, data: Mapping[str, object]) -> SAModel:
         try:
@@ -84,32 +451,143 @@ class BaseRepository(ABC, Generic[SAModel]):
 
         self.session.add(new_instance)
 
-        await self.session.commit()
+        await commit(self.session)
         await self.session.refresh(new_instance)
 
         return new_instance
 
-    async def update(self, model_id: int, data: Mapping[str, object]) -> SAModel:
+    def _upsert_insert(self) -> postgresql.Insert | sqlite.Insert:
+        """Returns an INSERT supporting ON CONFLICT for the dialect of the session."""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(self.model)
+        if dialect == "sqlite":
+            return sqlite.insert(self.model)
+        raise NotImplementedError(f"ON CONFLICT is not supported by {dialect}")
+
+    async def insert_or_ignore(
+        self, data: Mapping[str, object], conflict_keys: Sequence[str]
+    ) -> SAModel | None:
+        """Creates an instance unless it conflicts with an existing one, in a single
+        INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        Unlike checking first and inserting afterwards, concurrent calls can't race.
+
+        Args:
+            data (Mapping[str, object]): The fields of the instance.
+            conflict_keys (Sequence[str]): Columns of the unique index checked for conflicts.
+
+        Returns:
+            SAModel | None: The created instance or None if it conflicted.
+        """
+        self._validate_keys(data)
+        self._validate_keys(dict.fromkeys(conflict_keys))
+
+        statement = (
+            self._upsert_insert()
+            .values(**data)
+            .on_conflict_do_nothing(
+                index_elements=[self._key_expression(key) for key in conflict_keys]
+            )
+            .returning(self.model)
+        )
+        result = await self.session.scalars(statement)
+        instance = result.first()
+
+        await commit(self.session)
+        return instance
+
+    async def upsert(
+        self,
+        data: Mapping[str, object],
+        conflict_keys: Sequence[str],
+        update_keys: Sequence[str] | None = None,
+    ) -> SAModel:
+        """Creates an instance or updates the conflicting one, in a single
+        INSERT ... ON CONFLICT DO UPDATE RETURNING.
+
+        Args:
+            data (Mapping[str, object]): The fields of the instance.
+            conflict_keys (Sequence[str]): Columns of the unique index checked for conflicts.
+            update_keys (Sequence[str] | None, optional): Fields updated on conflict. Defaults to every field in `data` but the `conflict_keys`.
+
+        Raises:
+            ValueError: Raised if there are no fields to update.
+
+        Returns:
+            SAModel: The created or updated instance.
+        """
+        if update_keys is None:
+            update_keys = [key for key in data if key not in conflict_keys]
+        if not update_keys:
+            raise ValueError("No data provided for update.")
+
+        self._validate_keys(data)
+        self._validate_keys(dict.fromkeys([*conflict_keys, *update_keys]))
+
+        insert_statement = self._upsert_insert().values(**data)
+        statement = (
+            insert_statement.on_conflict_do_update(
+                index_elements=[self._key_expression(key) for key in conflict_keys],
+                set_={key: insert_statement.excluded[key] for key in update_keys},
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.scalars(statement)
+        instance: SAModel = result.one()
+
+        await commit(self.session)
+        return instance
+
+    async def _update_returning(
+        self, data: Mapping[str, object], *criteria: ColumnElement[bool]
+    ) -> SAModel | None:
+        """Runs a single UPDATE ... RETURNING, no rows are locked before it."""
         if not data:
             raise ValueError("No data provided for update.")
 
         self._validate_keys(data)
 
         statement = (
-            select(self.model).where(self.model.id == model_id).with_for_update()
+            update(self.model)
+            .where(*criteria)
+            .values(**data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
         )
         result = await self.session.scalars(statement)
         instance = result.first()
 
+        await commit(self.session)
+        return instance
+
+    async def update(self, model_id: int, data: Mapping[str, object]) -> SAModel:
+        instance = await self._update_returning(data, self.model.id == model_id)
+
         if instance:
-            for key, value in data.items():
-                setattr(instance, key, value)
-            await self.session.commit()
-            await self.session.refresh(instance)
             return instance
         else:
             raise ValueError(f"Instance with id {model_id} not found")
 
+    async def update_by_attributes(
+        self, data: Mapping[str, object], **kwargs: object
+    ) -> SAModel | None:
+        """Updates the instance matching the attributes in a single statement.
+
+        Every matching row is updated, so filter by unique attributes.
+
+        Args:
+            data (Mapping[str, object]): The fields to update.
+            **kwargs: Attributes to filter by.
+
+        Returns:
+            SAModel | None: The updated instance or None if nothing matched.
+        """
+        self._validate_keys(kwargs)
+
+        return await self._update_returning(data, *self._criteria(kwargs))
+
     async def update_instance(
         self, instance: SAModel, data: Mapping[str, object]
     ) -> SAModel:
@@ -130,19 +608,140 @@ class BaseRepository(ABC, Generic[SAModel]):
         for key, value in data.items():
             setattr(instance, key, value)
 
-        await self.session.commit()
+        await commit(self.session)
         await self.session.refresh(instance)
         return instance
 
     async def delete(self, model_id: int) -> None:
-        statement = select(self.model).where(self.model.id == model_id)
+        statement = (
+            delete(self.model).where(self.model.id == model_id).returning(self.model.id)
+        )
         result = await self.session.scalars(statement)
 
-        instance = result.first()
-
-        if instance:
-            await self.session.delete(instance)
+        deleted_id = result.first()
 
-            await self.session.commit()
+        if deleted_id is not None:
+            await commit(self.session)
         else:
             raise ValueError(f"Instance with id {model_id} not found")
+
+    async def create_many(
+        self,
+        data: Sequence[Mapping[str, object]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> list[SAModel]:
+        """Creates many instances with one multi row INSERT ... RETURNING per batch.
+
+        Each batch is committed on its own (flushed inside a unit of work), the
+        returned instances are populated from RETURNING so no refresh is needed.
+
+        Args:
+            data (Sequence[Mapping[str, object]]): The fields of each instance.
+            batch_size (int, optional): Rows per INSERT statement. Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            list[SAModel]: The created instances, in the same order as `data`.
+        """
+        for values in data:
+            self._validate_keys(values)
+
+        instances: list[SAModel] = []
+        statement = insert(self.model).returning(
+            self.model, sort_by_parameter_order=True
+        )
+        for batch in batched(data, batch_size):
+            result = await self.session.scalars(statement, list(batch))
+            instances.extend(result.all())
+            await commit(self.session)
+
+        return instances
+
+    async def update_many(
+        self,
+        data: Mapping[int, Mapping[str, object]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Updates many instances by id with an executemany UPDATE per batch.
+
+        Instances already loaded in the session are updated in place.
+
+        Args:
+            data (Mapping[int, Mapping[str, object]]): The fields to update, by instance id.
+            batch_size (int, optional): Rows per UPDATE statement. Defaults to DEFAULT_BATCH_SIZE.
+
+        Raises:
+            ValueError: Raised if an instance of a batch wasn't found, that batch is rolled back.
+        """
+        for values in data.values():
+            if not values:
+                raise ValueError("No data provided for update.")
+            self._validate_keys(values)
+
+        for batch in batched(data.items(), batch_size):
+            parameters = [{**values, "id": model_id} for model_id, values in batch]
+            try:
+                await self.session.execute(update(self.model), parameters)
+            except StaleDataError:
+                if not in_unit_of_work(self.session):
+                    await self.session.rollback()
+                raise ValueError(
+                    f"Instances of {self.model.__name__} not found for update"
+                )
+            await commit(self.session)
+
+    async def delete_many(
+        self,
+        ids: Sequence[int] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        **kwargs: object,
+    ) -> list[int]:
+        """Deletes many instances by id and/or attributes with DELETE ... RETURNING.
+
+        When no ids are given every instance matching the attributes is deleted,
+        `batch_size` rows at a time so no single transaction gets too large.
+
+        Args:
+            ids (Sequence[int] | None, optional): Ids of the instances to delete. Defaults to None.
+            batch_size (int, optional): Rows per DELETE statement. Defaults to DEFAULT_BATCH_SIZE.
+            **kwargs: Attributes to filter by.
+
+        Raises:
+            ValueError: Raised if neither ids nor attributes are provided.
+
+        Returns:
+            list[int]: The ids of the deleted instances.
+        """
+        if ids is None and not kwargs:
+            raise ValueError("No ids or attributes provided for delete.")
+
+        self._validate_keys(kwargs)
+
+        deleted: list[int] = []
+        if ids is not None:
+            for batch in batched(ids, batch_size):
+                statement = (
+                    delete(self.model)
+                    .where(self.model.id.in_(batch), *self._criteria(kwargs))
+                    .returning(self.model.id)
+                )
+                result = await self.session.scalars(statement)
+                deleted.extend(result.all())
+                await commit(self.session)
+            return deleted
+
+        while True:
+            batch_ids = (
+                select(self.model.id).where(*self._criteria(kwargs)).limit(batch_size)
+            )
+            statement = (
+                delete(self.model)
+                .where(self.model.id.in_(batch_ids))
+                .returning(self.model.id)
+            )
+            result = await self.session.scalars(statement)
+            batch_deleted = result.all()
+            deleted.extend(batch_deleted)
+            await commit(self.session)
+
+            if len(batch_deleted) < batch_size:
+                return deleted
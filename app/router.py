@@ -1,5 +1,10 @@
-from fastapi import APIRouter
+from typing import Any
 
+from fastapi import APIRouter, Response
+
+from app.database.core import engines
+from app.database.pool import pool_stats
+from app.users.keys import get_key_ring
 from app.users.router import router as user_router
 
 api_router = APIRouter(
@@ -16,3 +21,21 @@ api_router.include_router(
 @api_router.get("/healthcheck", include_in_schema=False)
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@api_router.get("/metrics/pool", include_in_schema=False)
+def pool_metrics() -> dict[str, dict[str, Any]]:
+    """
+    Connection pool metrics of the primary and each replica
+    """
+    return pool_stats(engines)
+
+
+@api_router.get("/.well-known/jwks.json", tags=["Authentication"])
+def jwks(response: Response) -> dict[str, list[dict[str, Any]]]:
+    """
+    Public keys access tokens are signed with, to verify them without calling the API
+    """
+    # verifiers refetch it at most every 5 minutes, publish new keys longer before use
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return get_key_ring().jwks()
@@ -1,5 +1,23 @@
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel, ConfigDict
 
+T = TypeVar("T")
+
 
 class DefaultModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
+
+
+class PageSchema(DefaultModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def serialized_fields(model: type[BaseModel]) -> set[str]:
+    """Returns the fields `model` reads from the objects it serializes, the ones of
+    its items for a `PageSchema`."""
+    if issubclass(model, PageSchema):
+        (item_model,) = model.__pydantic_generic_metadata__["args"]
+        return serialized_fields(item_model)
+    return set(model.model_fields)
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from celery.backends.database import DatabaseBackend, session_cleanup  # type: ignore
+from sqlalchemy import Index, Table, delete, select
+
+from app.config import settings
+from app.config_celery import app
+from app.utils import get_logger
+
+logger = get_logger()
+
+
+def _date_done_index(table: Table) -> Index:
+    for index in table.indexes:
+        if list(index.columns) == [table.c.date_done]:
+            # declared by newer Celery versions
+            return index
+    # named like the indexes the migrations create in the app database
+    return Index(f"ix_{table.name}_date_done", table.c.date_done)
+
+
+def create_date_done_indexes(backend: DatabaseBackend) -> None:
+    """Creates the `date_done` indexes expired results are looked up by, if missing.
+
+    The migrations only index the result tables of the app database, Celery creates
+    its tables without them when `CELERY_RESULT_DATABASE_URL` is another database.
+
+    Args:
+        backend (DatabaseBackend): The result backend to index.
+    """
+    session = backend.ResultSession()
+    with session_cleanup(session):
+        bind = session.get_bind()
+    for model in (backend.task_cls, backend.taskset_cls):
+        _date_done_index(model.__table__).create(bind, checkfirst=True)
+
+
+def purge_expired_results(
+    backend: DatabaseBackend, expires: timedelta, batch_size: int
+) -> int:
+    """Deletes the task and group results stored more than `expires` ago.
+
+    Rows are deleted `batch_size` at a time, each batch in its own transaction, so
+    a large backlog doesn't hold locks or bloat a single transaction like Celery's
+    own `backend_cleanup`.
+
+    Args:
+        backend (DatabaseBackend): The result backend to purge.
+        expires (timedelta): How long results are kept.
+        batch_size (int): Rows deleted per transaction.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    cutoff = backend.app.now() - expires
+    deleted = 0
+
+    for model in (backend.task_cls, backend.taskset_cls):
+        while True:
+            expired = (
+                select(model.id)
+                .where(model.date_done < cutoff)
+                .order_by(model.id)
+                .limit(batch_size)
+            )
+            session = backend.ResultSession()
+            with session_cleanup(session):
+                result = session.execute(
+                    delete(model).where(model.id.in_(expired.scalar_subquery()))
+                )
+                session.commit()
+
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+    return deleted
+
+
+@app.task(ignore_result=True)  # type: ignore[misc]
+def purge_task_results() -> int:
+    """Purges the expired results of the database result backend, scheduled by beat."""
+    if not isinstance(app.backend, DatabaseBackend):
+        return 0
+
+    create_date_done_indexes(app.backend)
+    deleted = purge_expired_results(
+        app.backend,
+        expires=timedelta(hours=settings.CELERY_RESULT_EXPIRES_HOURS),
+        batch_size=settings.CELERY_RESULT_PURGE_BATCH_SIZE,
+    )
+    logger.info(f"purged {deleted} expired task results")
+    return deleted
@@ -0,0 +1,166 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from app.config import settings
+
+from .models import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The fields of a user authenticated requests need, cheap to keep in memory."""
+
+    id: int
+    email: str
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_claims(cls, claims: Mapping[str, Any]) -> "Principal | None":
+        """Returns the principal of a stateless access token, None for other tokens."""
+        try:
+            return cls(
+                id=int(claims["uid"]),
+                email=str(claims["sub"]),
+                is_active=bool(claims["active"]),
+                is_admin=bool(claims["admin"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+        )
+
+
+# the token version is compared to the one of the access token
+PRINCIPAL_COLUMNS = (*Principal.__slots__, "token_version")
+
+
+class PrincipalCache:
+    """LRU cache of the principals of recently seen access tokens.
+
+    Entries live for `ttl` seconds, never past the expiration of their token, and are
+    dropped as soon as their user changes through `invalidate`. The cache is per process,
+    other workers only notice the change once their entries expire, keep `ttl` short.
+
+    Usage:
+    principal = principal_cache.get(token)
+    if principal is None:
+        principal = ...
+        principal_cache.set(token, principal, claims)
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+
+    def get(self, token: str) -> Principal | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._remove(token)
+            return None
+
+        self._entries.move_to_end(token)
+        return principal
+
+    def set(self, token: str, principal: Principal, claims: Mapping[str, Any]) -> None:
+        ttl = self.ttl
+        expiration = claims.get("exp")
+        if isinstance(expiration, int | float):
+            ttl = min(ttl, expiration - time.time())
+        if ttl <= 0:
+            return
+
+        self._remove(token)
+        self._entries[token] = (time.monotonic() + ttl, principal)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id: int) -> None:
+        """Drops every cached principal of the user."""
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def discard(self, token: str) -> None:
+        self._remove(token)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+
+        tokens = self._tokens_by_user.get(entry[1].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1].id]
+
+
+class TokenVersionCache:
+    """LRU cache of the token version of recently seen users, see `AUTH_STATELESS_TOKENS`.
+
+    Like `PrincipalCache` it's per process, a version bumped by another worker is only
+    seen once the entry expires.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[float, int]] = OrderedDict()
+
+    def get(self, user_id: int) -> int | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, version = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return version
+
+    def set(self, user_id: int, version: int) -> None:
+        if self.ttl <= 0:
+            return
+
+        self._entries.pop(user_id, None)
+        self._entries[user_id] = (time.monotonic() + self.ttl, version)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS, max_size=settings.AUTH_CACHE_MAX_SIZE
+)
+token_versions = TokenVersionCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS, max_size=settings.AUTH_CACHE_MAX_SIZE
+)
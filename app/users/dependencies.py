@@ -4,10 +4,19 @@ import jwt
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 
-from app.database.dependencies import DbSession
-
-from .exceptions import AuthorizationFailed, InactiveUser, InvalidCredentials
+from app.config import settings
+from app.database.dependencies import DbSession, response_columns
+
+from .cache import PRINCIPAL_COLUMNS, Principal, principal_cache
+from .exceptions import (
+    AuthorizationFailed,
+    InactiveUser,
+    InvalidCredentials,
+    InvalidToken,
+)
 from .models import User
+from .repository import UserRepository
+from .revocation import revocation_list
 from .schema import TokenData
 from .service import UserService
 from .utils import decode_jwt
@@ -16,7 +25,12 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token/")
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
 
 
-async def get_current_user(session: DbSession, token: TokenDep) -> User | None:
+async def get_current_user(session: DbSession, token: TokenDep) -> Principal:
+    # tokens seen in the last seconds skip the decoding and the query
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     # validates the token and the email
     try:
         payload = decode_jwt(token)
@@ -27,27 +41,75 @@ async def get_current_user(session: DbSession, token: TokenDep) -> User | None:
     except jwt.InvalidTokenError:
         raise InvalidCredentials
 
-    return await UserService(session).get_user(user_email=token_data.email)
+    # refresh and email tokens aren't access tokens, every access token can be revoked
+    jti = payload.get("jti")
+    if payload.get("type") != "access" or not jti:
+        raise InvalidCredentials
+    if await revocation_list.is_revoked(session, jti):
+        raise InvalidCredentials
+
+    if settings.AUTH_STATELESS_TOKENS:
+        principal = Principal.from_claims(payload)
+        if principal is not None:
+            # authorized by the claims, only the version is checked to honor revocations
+            version = await UserService(session).get_token_version(principal.id)
+            if version is None or version != payload.get("ver"):
+                raise InvalidToken
+            principal_cache.set(token, principal, payload)
+            return principal
+
+    user = await UserService(session).get_user(
+        user_email=token_data.email, columns=PRINCIPAL_COLUMNS
+    )
+    if not user:
+        raise InvalidCredentials
+    # signed out everywhere, or its password or email changed, since the token was issued
+    if user.token_version != payload.get("ver"):
+        raise InvalidToken
+
+    principal = Principal.from_user(user)
+    principal_cache.set(token, principal, payload)
+    return principal
 
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+
+
+async def get_current_user_entity(
+    session: DbSession, current_user: CurrentUser
+) -> User:
+    """
+    The `User` row of the current user, for handlers that need more than its principal
+    """
+    user = await UserService(session).get_user(user_id=current_user.id)
+    if not user:
+        raise InvalidCredentials
+    return user
+
+
+CurrentUserEntity = Annotated[User, Depends(get_current_user_entity)]
 
 
 async def get_current_active_user(
     current_user: CurrentUser,
-) -> User | None:
+) -> Principal:
     if not current_user.is_active:
         raise InactiveUser
     return current_user
 
 
-CurrentActiveUser = Annotated[User, Depends(get_current_active_user)]
+CurrentActiveUser = Annotated[Principal, Depends(get_current_active_user)]
 
 
-async def get_current_superuser(current_user: CurrentActiveUser) -> User | None:
+async def get_current_superuser(current_user: CurrentActiveUser) -> Principal:
     if not current_user.is_admin:
         raise AuthorizationFailed
     return current_user
 
 
-CurrentSuperUser = Annotated[User, Depends(get_current_superuser)]
+CurrentSuperUser = Annotated[Principal, Depends(get_current_superuser)]
+
+# only load what the responses serialize, hashed passwords never leave the database
+UserColumns = Annotated[
+    tuple[str, ...] | None, Depends(response_columns(UserRepository))
+]
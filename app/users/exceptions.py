@@ -3,6 +3,8 @@ from app.exceptions import (
     DetailedHTTPException,
     NotAuthenticated,
     PermissionDenied,
+    ServiceUnavailable,
+    TooManyRequests,
 )
 
 
@@ -22,6 +24,17 @@ class InvalidCredentials(PermissionDenied):
     DETAIL = "Login failed, invalid email or password"
 
 
+class TooManyLoginAttempts(TooManyRequests):
+    DETAIL = "Too many login attempts, try again later."
+
+
+class PasswordHasherBusy(ServiceUnavailable):
+    DETAIL = "Too many logins at once, try again later."
+
+    def __init__(self) -> None:
+        super().__init__(headers={"Retry-After": "1"})
+
+
 class EmailTaken(BadRequest):
     DETAIL = "Email is already taken."
 
@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, TypeVar
+
+from app.config import settings
+
+from .exceptions import PasswordHasherBusy
+from .utils import get_password_hash, verify_and_update_password, verify_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Runs Argon2 in an executor so hashing never blocks the event loop.
+
+    At most `max_concurrency` hashes run at once, the rest wait on the event loop
+    without taking a worker, so logins can't use every core of the host. Once
+    `max_queue` are waiting, more hashes are refused with `PasswordHasherBusy` instead
+    of queuing for longer than clients would wait.
+
+    Usage:
+    hashed_password = await password_hasher.hash(password)
+    """
+
+    def __init__(
+        self,
+        executor: Literal["thread", "process"] = "thread",
+        max_workers: int = 1,
+        max_concurrency: int | None = None,
+        max_queue: int | None = None,
+    ) -> None:
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+        self.max_concurrency = max_concurrency or max_workers
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending = 0
+
+    @property
+    def executor(self) -> Executor:
+        # created on first use, a process pool shouldn't be forked on import
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="argon2"
+                )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Raises:
+            PasswordHasherBusy: Raised if `max_queue` hashes are already waiting.
+        """
+        if (
+            self.max_queue is not None
+            and self._pending >= self.max_concurrency + self.max_queue
+        ):
+            raise PasswordHasherBusy
+
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.executor, func, *args
+                )
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(
+            verify_and_update_password, plain_password, hashed_password
+        )
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
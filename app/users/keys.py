@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import jwt
+from jwt.algorithms import has_crypto
+
+from app.config import settings
+
+SYMMETRIC_ALGORITHMS = frozenset({"HS256"})
+
+
+@dataclass(frozen=True)
+class Key:
+    """A parsed key of the key ring, PyJWT would parse the PEM again on every call."""
+
+    kid: str
+    key: Any
+    # public half of the key as a JWK, None for symmetric keys which are never published
+    jwk: dict[str, Any] | None = field(default=None, compare=False)
+
+    @property
+    def can_sign(self) -> bool:
+        return hasattr(self.key, "sign") or isinstance(self.key, bytes)
+
+
+class KeyRing:
+    """Keys access tokens are signed and verified with, selected by the `kid` header.
+
+    With an asymmetric algorithm every `<kid>.pem` file in `keys_dir` is loaded, private
+    keys or public only ones, and published in the JWKS so other services can verify
+    tokens on their own. Tokens are signed with `signing_kid`.
+
+    Rotating keys overlaps them:
+    1. Add the new key file, it's published but not used yet.
+    2. Once verifiers picked up the JWKS, set `JWT_SIGNING_KEY_ID` to the new key.
+    3. Once the tokens of the old key expired, remove its file.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str,
+        keys_dir: Path | None = None,
+        signing_kid: str | None = None,
+    ) -> None:
+        self.algorithm = algorithm
+        self.keys: dict[str, Key] = {}
+
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            self.signing_key = Key(kid="", key=secret.encode())
+            return
+
+        if not has_crypto:
+            raise RuntimeError(
+                f"{algorithm} requires the cryptography package, install pyjwt[crypto]"
+            )
+        if keys_dir is None or signing_kid is None:
+            raise ValueError(
+                f"{algorithm} requires JWT_KEYS_DIR and JWT_SIGNING_KEY_ID to be set"
+            )
+
+        jwt_algorithm = jwt.get_algorithm_by_name(algorithm)
+        for path in sorted(keys_dir.glob("*.pem")):
+            key = jwt_algorithm.prepare_key(path.read_bytes())
+            public_key = key.public_key() if hasattr(key, "public_key") else key
+            jwk = jwt_algorithm.to_jwk(public_key, as_dict=True)
+            jwk.update(kid=path.stem, alg=algorithm, use="sig")
+            self.keys[path.stem] = Key(kid=path.stem, key=key, jwk=jwk)
+
+        signing_key = self.keys.get(signing_kid)
+        if signing_key is None or not signing_key.can_sign:
+            raise ValueError(f"No private key {signing_kid}.pem in {keys_dir}")
+        self.signing_key = signing_key
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        headers = {"kid": self.signing_key.kid} if self.signing_key.kid else None
+        return jwt.encode(
+            payload, self.signing_key.key, algorithm=self.algorithm, headers=headers
+        )
+
+    def decode(self, token: str) -> Any:
+        """
+        Raises:
+            jwt.InvalidTokenError: Raised if the token is invalid or signed with an unknown key.
+        """
+        if self.algorithm in SYMMETRIC_ALGORITHMS:
+            key = self.signing_key
+        else:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if kid not in self.keys:
+                raise jwt.InvalidTokenError(f"Unknown signing key {kid}")
+            key = self.keys[kid]
+
+        return jwt.decode(token, key.key, algorithms=[self.algorithm])
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """The public keys in JSON Web Key Set format, empty for symmetric algorithms."""
+        return {"keys": [key.jwk for key in self.keys.values() if key.jwk]}
+
+
+@cache
+def get_key_ring() -> KeyRing:
+    return KeyRing(
+        algorithm=settings.JWT_ALGORITHM,
+        secret=settings.SECRET_KEY,
+        keys_dir=settings.JWT_KEYS_DIR,
+        signing_kid=settings.JWT_SIGNING_KEY_ID,
+    )
@@ -1,3 +1,6 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.core import Base
@@ -7,10 +10,36 @@ class User(Base):
     __tablename__ = "user"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    email: Mapped[str] = mapped_column(unique=True)
+    # kept as typed, unique regardless of case through uq_user_lower_email
+    email: Mapped[str] = mapped_column()
     hashed_password: Mapped[str]
     is_admin: Mapped[bool] = mapped_column(default=False)
     is_active: Mapped[bool] = mapped_column(default=True)
+    # bumped to revoke the stateless access tokens of the user
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    __table_args__ = (Index("uq_user_lower_email", func.lower(email), unique=True),)
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[str] = mapped_column(unique=True)
+    # the row can be purged once the token would have expired anyway
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+class LoginThrottle(Base):
+    """Token bucket of login attempts shared between workers, see `app/users/throttling.py`."""
+
+    __tablename__ = "login_throttle"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[str] = mapped_column(unique=True)
+    tokens: Mapped[float]
+    # unix time the tokens were counted at, plain seconds so any database can refill them
+    updated_at: Mapped[float] = mapped_column(index=True)
 
 
 __all__ = ["Base"]
@@ -1,7 +1,136 @@
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import Row, case, delete, select
+
+from app.database.unit_of_work import commit, release_after_read
 from app.repository import BaseRepository
+from app.utils import get_current_time
 
-from .models import User
+from .models import LoginThrottle, RevokedToken, User
 
 
 class UserRepository(BaseRepository[User]):
     model = User
+    case_insensitive_keys = frozenset({"email"})
+
+    async def get_emails(
+        self,
+        limit: int,
+        min_id: int | None = None,
+        max_id: int | None = None,
+        **kwargs: object,
+    ) -> Sequence[Row[tuple[int, str]]]:
+        """Returns the id and email of up to `limit` users ordered by id.
+
+        Args:
+            limit (int): Maximum number of users.
+            min_id (int | None, optional): Lowest id included. Defaults to None.
+            max_id (int | None, optional): Highest id included. Defaults to None.
+            **kwargs: Attributes to filter by.
+        """
+        self._validate_keys(kwargs)
+
+        statement = select(self.model.id, self.model.email).where(
+            *self._criteria(kwargs)
+        )
+        if min_id is not None:
+            statement = statement.where(self.model.id >= min_id)
+        if max_id is not None:
+            statement = statement.where(self.model.id <= max_id)
+        result = await self.session.execute(
+            statement.order_by(self.model.id).limit(limit)
+        )
+        rows = result.all()
+
+        await release_after_read(self.session)
+        return rows
+
+
+class RevokedTokenRepository(BaseRepository[RevokedToken]):
+    model = RevokedToken
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        await self.insert_or_ignore(
+            {"jti": jti, "expires_at": expires_at}, conflict_keys=["jti"]
+        )
+
+    async def is_revoked(self, jti: str) -> bool:
+        return await self.get_by_attributes(columns=["id"], jti=jti) is not None
+
+    async def get_unexpired_since(self, last_id: int) -> Sequence[Row[tuple[int, str]]]:
+        """Returns the id and jti of the tokens revoked after `last_id` that haven't expired."""
+        statement = (
+            select(self.model.id, self.model.jti)
+            .where(self.model.id > last_id, self.model.expires_at > get_current_time())
+            .order_by(self.model.id)
+        )
+        result = await self.session.execute(statement)
+        rows = result.all()
+
+        await release_after_read(self.session)
+        return rows
+
+    async def delete_expired(self) -> int:
+        """Deletes the tokens that expired, they are rejected without the denylist."""
+        statement = (
+            delete(self.model)
+            .where(self.model.expires_at <= get_current_time())
+            .returning(self.model.id)
+        )
+        result = await self.session.scalars(statement)
+        deleted = len(result.all())
+
+        await commit(self.session)
+        return deleted
+
+
+class LoginThrottleRepository(BaseRepository[LoginThrottle]):
+    model = LoginThrottle
+
+    async def take(self, key: str, rate: float, capacity: int, now: float) -> bool:
+        """Takes a token from the bucket of `key` in a single INSERT ... ON CONFLICT.
+
+        The bucket is refilled with `rate` tokens per second since it was last updated,
+        up to `capacity`. When less than a token is left the conflict isn't updated and
+        nothing is returned, so concurrent workers can't both take the last token.
+
+        Args:
+            key (str): Identifies the bucket.
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, a new bucket starts full.
+            now (float): The current unix time.
+
+        Returns:
+            bool: True if a token was taken.
+        """
+        elapsed = now - self.model.updated_at
+        refilled = self.model.tokens + elapsed * rate
+        tokens = case((refilled > capacity, capacity), else_=refilled)
+
+        insert_statement = self._upsert_insert().values(
+            key=key, tokens=capacity - 1, updated_at=now
+        )
+        statement = insert_statement.on_conflict_do_update(
+            index_elements=[self.model.key],
+            set_={"tokens": tokens - 1, "updated_at": now},
+            where=tokens >= 1,
+        ).returning(self.model.key)
+        result = await self.session.execute(statement)
+        taken = result.first() is not None
+
+        await commit(self.session)
+        return taken
+
+    async def delete_idle(self, before: float) -> int:
+        """Deletes the buckets not updated since `before`, they would be full again."""
+        statement = (
+            delete(self.model)
+            .where(self.model.updated_at < before)
+            .returning(self.model.key)
+        )
+        result = await self.session.scalars(statement)
+        deleted = len(result.all())
+
+        await commit(self.session)
+        return deleted
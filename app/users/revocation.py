@@ -0,0 +1,122 @@
+import hashlib
+import math
+import time
+from collections import deque
+from typing import Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+from .repository import RevokedTokenRepository
+
+
+class BloomFilter:
+    """Set of strings in a fixed number of bits, with false positives but no false negatives.
+
+    Sized so that the false positive rate stays under `error_rate` until `capacity`
+    items are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # double hashing, two halves of one digest make every position
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8])
+        second = int.from_bytes(digest[8:]) | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """Per worker Bloom filter of revoked token ids in front of the `revoked_token` table.
+
+    Almost no token is revoked, the filter rules those out without I/O. At most every
+    `refresh_interval` seconds it's refreshed with the tokens revoked since the last
+    refresh, and rebuilt from the unexpired ones once it holds `capacity` tokens.
+    Tokens the filter may contain are looked up in the table to rule out false positives.
+
+    Ids are allocated before the transaction revoking the token commits, a lower id
+    can become visible after a higher one was read. Each refresh re-reads the ids
+    above the highest one seen `overlap` seconds earlier, so revocations committed
+    within `overlap` seconds of getting their id are never skipped.
+    """
+
+    def __init__(
+        self, capacity: int, refresh_interval: float, overlap: float = 60
+    ) -> None:
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        self.overlap = overlap
+        self.clear()
+
+    def clear(self) -> None:
+        self._filter = BloomFilter(self.capacity)
+        # (refreshed at, highest id seen), oldest first
+        self._watermarks: deque[tuple[float, int]] = deque([(-math.inf, 0)])
+        self._refreshed_at = -math.inf
+
+    def add(self, jti: str) -> None:
+        """Adds a token revoked by this worker, so it's rejected before the next refresh."""
+        self._filter.add(jti)
+
+    def _overlapping_id(self, now: float) -> int:
+        """Returns the highest id seen by the last refresh at least `overlap` seconds ago."""
+        while (
+            len(self._watermarks) > 1 and self._watermarks[1][0] <= now - self.overlap
+        ):
+            self._watermarks.popleft()
+        return self._watermarks[0][1]
+
+    async def refresh(self, session: AsyncSession) -> None:
+        repository = RevokedTokenRepository(session)
+        now = time.monotonic()
+
+        if self._filter.count >= self._filter.capacity:
+            rows = await repository.get_unexpired_since(0)
+            # keep the false positive rate low when more tokens are revoked than expected
+            self._filter = BloomFilter(max(self.capacity, 2 * len(rows)))
+        else:
+            rows = await repository.get_unexpired_since(self._overlapping_id(now))
+
+        last_id = self._watermarks[-1][1]
+        for row_id, jti in rows:
+            # re-read rows are already in, don't count them towards the capacity
+            if jti not in self._filter:
+                self._filter.add(jti)
+            last_id = max(last_id, row_id)
+        self._watermarks.append((now, last_id))
+        self._refreshed_at = now
+
+    async def is_revoked(self, session: AsyncSession, jti: str) -> bool:
+        if time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            await self.refresh(session)
+
+        if jti not in self._filter:
+            return False
+        return await RevokedTokenRepository(session).is_revoked(jti)
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    refresh_interval=settings.REVOCATION_REFRESH_SECONDS,
+    overlap=settings.REVOCATION_OVERLAP_SECONDS,
+)
@@ -1,42 +1,90 @@
 from datetime import timedelta
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.config import settings
 from app.database.dependencies import DbSession
 from app.email.utils import decode_email_token
+from app.users.dependencies import CurrentUser, TokenDep
 from app.users.exceptions import InvalidToken
 from app.users.schema import (
     AuthUser,
     PasswordModel,
+    RefreshToken,
     Token,
     UserCreate,
     UserResetPassword,
     UserSchema,
 )
 from app.users.service import UserService
-from app.users.utils import create_access_token, generate_random_password
+from app.users.throttling import login_throttle
+from app.users.utils import (
+    access_token_claims,
+    create_access_token,
+    create_refresh_token,
+    generate_random_password,
+)
 
 router = APIRouter()
 
 
 @router.post("/token", response_model=Token)
 async def login(
+    request: Request,
     session: DbSession,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     user_data = AuthUser(password=form_data.password, email=form_data.username)
 
+    ip = request.client.host if request.client else None
+    await login_throttle.check(session, ip=ip, email=user_data.email)
+
     user = await UserService(session).authenticate(user_data.email, user_data.password)
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=access_token_claims(user), expires_delta=access_token_expires
+    )
+
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=create_refresh_token(user),
+    )
+
+
+@router.post("/token/refresh", response_model=Token)
+async def refresh_access_token(session: DbSession, body: RefreshToken) -> Token:
+    """
+    Returns a new access token for the `refresh_token` returned on login
+    """
+    user = await UserService(session).authenticate_refresh_token(body.refresh_token)
+
+    access_token = create_access_token(data=access_token_claims(user))
+
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=body.refresh_token,
     )
 
-    return Token(access_token=access_token, token_type="bearer")
+
+@router.post("/logout")
+async def logout(
+    session: DbSession,
+    token: TokenDep,
+    current_user: CurrentUser,
+    body: RefreshToken | None = None,
+) -> Any:
+    """
+    Revokes the access token of the request, and the refresh token if provided
+    """
+    await UserService(session).sign_out(
+        access_token=token, refresh_token=body.refresh_token if body else None
+    )
+    return {"description": "Signed out."}
 
 
 @router.get("/generate-password", response_model=PasswordModel)
@@ -1,9 +1,11 @@
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
 from app.database.dependencies import DbSession
-from app.users.dependencies import CurrentSuperUser
+from app.repository import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schema import PageSchema
+from app.users.dependencies import CurrentSuperUser, UserColumns
 from app.users.schema import (
     UserCreate,
     UserSchema,
@@ -13,17 +15,31 @@ from app.users.service import UserService
 router = APIRouter()
 
 
-@router.get("/users", response_model=list[UserSchema])
-async def get_users(session: DbSession, current_superuser: CurrentSuperUser) -> Any:
-    users = await UserService(session).get_users()
-    return users
+@router.get("/users", response_model=PageSchema[UserSchema])
+async def get_users(
+    session: DbSession,
+    current_superuser: CurrentSuperUser,
+    columns: UserColumns,
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+) -> Any:
+    """
+    Lists users `limit` at a time, pass the returned `next_cursor` to get the next page
+    """
+    page = await UserService(session).get_users_page(
+        cursor=cursor, limit=limit, columns=columns
+    )
+    return PageSchema[UserSchema].model_validate(page)
 
 
 @router.get("/users/{user_id}", response_model=UserSchema)
 async def get_user(
-    user_id: int, session: DbSession, current_superuser: CurrentSuperUser
+    user_id: int,
+    session: DbSession,
+    current_superuser: CurrentSuperUser,
+    columns: UserColumns,
 ) -> Any:
-    user = await UserService(session).get_user(user_id=user_id)
+    user = await UserService(session).get_user(user_id=user_id, columns=columns)
     return user
 
 
@@ -34,3 +50,14 @@ async def create_user(
     new_user = await UserService(session).create_user(user_data=user.model_dump())
 
     return new_user
+
+
+@router.post("/users/{user_id}/sign-out", response_model=UserSchema)
+async def sign_out_user(
+    user_id: int, session: DbSession, current_superuser: CurrentSuperUser
+) -> Any:
+    """
+    Signs a user out of every device, its refresh tokens stop being valid
+    """
+    user = await UserService(session).sign_out_everywhere(user_id=user_id)
+    return user
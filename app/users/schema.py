@@ -58,3 +58,8 @@ class TokenData(DefaultModel):
 class Token(DefaultModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshToken(DefaultModel):
+    refresh_token: str
@@ -1,25 +1,55 @@
-from typing import Any, Sequence
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+from typing import Any, Iterable, Sequence
 
+import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.users.tasks import send_new_user_email, send_reset_password_email
+from app.config import settings
+from app.database.unit_of_work import unit_of_work
+from app.email.utils import BulkEmail
+from app.exceptions import InvalidCursor
+from app.outbox.relay import enqueue_task
+from app.repository import DEFAULT_PAGE_SIZE, Page
+from app.users.tasks import (
+    send_bulk_email,
+    send_new_user_email,
+    send_reset_password_email,
+)
 
+from .cache import Principal, principal_cache, token_versions
 from .exceptions import (
     AuthorizationFailed,
     EmailTaken,
     InvalidCredentials,
+    RefreshTokenNotValid,
     UserNotRegistered,
 )
+from .hashing import password_hasher
 from .models import User
-from .repository import UserRepository
-from .utils import get_password_hash, verify_password
+from .repository import RevokedTokenRepository, UserRepository
+from .revocation import revocation_list
+from .utils import decode_jwt
+
+# changing any of these revokes the stateless access tokens of the user
+TOKEN_REVOKING_FIELDS = frozenset({"email", "hashed_password", "is_active", "is_admin"})
 
 
 class UserService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    def hash_password(self, user_data: dict[str, Any]) -> dict[str, Any]:
+    def unit_of_work(self) -> AbstractAsyncContextManager[AsyncSession]:
+        """Groups the service calls made inside the returned scope into one transaction.
+
+        Usage:
+        async with user_service.unit_of_work():
+            user = await user_service.create_user(...)
+            await user_service.update_user(...)
+        """
+        return unit_of_work(self.session)
+
+    async def hash_password(self, user_data: dict[str, Any]) -> dict[str, Any]:
         """
         Removes the `password` field and value from `user_data` if available, then
         adds a new `hashed_password` field with a hashed password
@@ -33,14 +63,42 @@ class UserService:
         """
         password = user_data.pop("password", None)
         if password:
-            user_data["hashed_password"] = get_password_hash(password=password)
+            user_data["hashed_password"] = await password_hasher.hash(password)
         return user_data
 
+    def revoke_tokens(self, user_data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Bumps the token version in `user_data` if it changes a field access tokens
+        carry or depend on, so tokens issued before the update stop being valid
+        """
+        if TOKEN_REVOKING_FIELDS.intersection(user_data):
+            user_data["token_version"] = User.token_version + 1
+        return user_data
+
+    def forget_user(self, user_id: int) -> None:
+        """Drops the cached principals and token version of the user after it changes."""
+        principal_cache.invalidate(user_id)
+        token_versions.invalidate(user_id)
+
+    async def get_token_version(self, user_id: int) -> int | None:
+        """Returns the current token version of a user, None if it doesn't exist."""
+        version = token_versions.get(user_id)
+        if version is None:
+            user = await UserRepository(self.session).get(
+                user_id, columns=["token_version"]
+            )
+            if not user:
+                return None
+            version = user.token_version
+            token_versions.set(user_id, version)
+        return version
+
     async def get_user(
         self,
         user_id: int | None = None,
         user_email: str | None = None,
         raise_exception: bool = True,
+        columns: Iterable[str] | None = None,
     ) -> User | None:
         """Generic method to fetch a user
 
@@ -48,6 +106,7 @@ class UserService:
             user_id (int | None, optional): Primary key of a user. Defaults to None.
             user_email (str | None, optional): Email of a user. Defaults to None.
             raise_exception (bool, optional): If True, will raise an exception if the user is not found. Defaults to True.
+            columns (Iterable[str] | None, optional): Only load these columns. Defaults to every column.
 
         Raises:
             ValueError: Raised if a user identifier is not provided.
@@ -67,7 +126,9 @@ class UserService:
         if user_email:
             filters["email"] = user_email
 
-        user = await UserRepository(self.session).get_by_attributes(**filters)
+        user = await UserRepository(self.session).get_by_attributes(
+            columns=columns, **filters
+        )
         if not user and raise_exception:
             raise UserNotRegistered
         return user
@@ -77,22 +138,138 @@ class UserService:
 
         return users
 
+    async def get_users_page(
+        self,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        columns: Iterable[str] | None = None,
+    ) -> Page[User]:
+        """Fetches a page of users ordered by id.
+
+        Args:
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            limit (int, optional): Maximum number of users in the page. Defaults to DEFAULT_PAGE_SIZE.
+            columns (Iterable[str] | None, optional): Only load these columns. Defaults to every column.
+
+        Raises:
+            InvalidCursor: Raised if the cursor is malformed.
+
+        Returns:
+            Page[User]: The users and the cursor of the next page.
+        """
+        try:
+            return await UserRepository(self.session).get_page(
+                cursor=cursor, limit=limit, columns=columns
+            )
+        except ValueError:
+            raise InvalidCursor
+
     async def authenticate(self, email: str, password: str) -> User:
         user = await self.get_user(user_email=email, raise_exception=False)
         if not user:
             raise InvalidCredentials
-        if not verify_password(password, user.hashed_password):
+        verified, updated_hash = await password_hasher.verify_and_update(
+            password, user.hashed_password
+        )
+        if not verified:
             raise InvalidCredentials
+        if updated_hash:
+            # hashed with outdated Argon2 parameters, upgrade it now the password is known
+            user = await UserRepository(self.session).update(
+                model_id=user.id, data={"hashed_password": updated_hash}
+            )
         return user
 
-    async def create_user(self, user_data: dict[str, Any]) -> User:
+    async def authenticate_refresh_token(self, refresh_token: str) -> User:
+        """Returns the user a refresh token was issued to.
+
+        Args:
+            refresh_token (str): refresh token returned on login
+
+        Raises:
+            RefreshTokenNotValid: raised if the token is invalid, expired or revoked, or
+                the token version of the user changed since it was issued
+
+        Returns:
+            User: the user of the token
+        """
         try:
-            await self.get_user(user_email=user_data.get("email"))
-            raise EmailTaken
-        except UserNotRegistered:
-            new_user = await UserRepository(self.session).create(
-                data=self.hash_password(user_data=user_data)
+            payload = decode_jwt(refresh_token)
+        except jwt.InvalidTokenError:
+            raise RefreshTokenNotValid
+
+        user_id = payload.get("uid")
+        if payload.get("type") != "refresh" or not isinstance(user_id, int):
+            raise RefreshTokenNotValid
+        if await revocation_list.is_revoked(self.session, payload.get("jti", "")):
+            raise RefreshTokenNotValid
+
+        user = await self.get_user(user_id=user_id, raise_exception=False)
+        if not user or user.token_version != payload.get("ver"):
+            raise RefreshTokenNotValid
+        return user
+
+    async def deny_token(self, token: str) -> None:
+        """Adds a token to the revocation denylist until it expires, invalid tokens are ignored."""
+        try:
+            payload = decode_jwt(token)
+        except jwt.InvalidTokenError:
+            return
+
+        jti, expiration = payload.get("jti"), payload.get("exp")
+        if not jti or not expiration:
+            return
+
+        await RevokedTokenRepository(self.session).revoke(
+            jti=jti, expires_at=datetime.fromtimestamp(expiration, tz=timezone.utc)
+        )
+        revocation_list.add(jti)
+        principal_cache.discard(token)
+
+    async def sign_out(
+        self, access_token: str, refresh_token: str | None = None
+    ) -> None:
+        """Revokes the access token of the request, and its refresh token if provided."""
+        async with self.unit_of_work():
+            await self.deny_token(access_token)
+            if refresh_token:
+                await self.deny_token(refresh_token)
+
+    async def sign_out_everywhere(self, user_id: int) -> User:
+        """
+        Forces a user to sign in again by bumping its token version, which invalidates
+        its access and refresh tokens.
+
+        Raises:
+            UserNotRegistered: raised if there's no user with that id
+        """
+        try:
+            user = await UserRepository(self.session).update(
+                model_id=user_id, data={"token_version": User.token_version + 1}
             )
+        except ValueError:
+            raise UserNotRegistered
+
+        self.forget_user(user_id)
+        return user
+
+    async def create_user(self, user_data: dict[str, Any]) -> User:
+        """Creates a user in a single INSERT, concurrent registrations can't race.
+
+        Args:
+            user_data (dict[str, Any]): data for the user, with a raw `password`
+
+        Raises:
+            EmailTaken: raised if there's already a user with that email
+
+        Returns:
+            User: the new user
+        """
+        new_user = await UserRepository(self.session).insert_or_ignore(
+            data=await self.hash_password(user_data=user_data), conflict_keys=["email"]
+        )
+        if not new_user:
+            raise EmailTaken
 
         return new_user
 
@@ -110,9 +287,12 @@ class UserService:
             User: unactivated user
         """
         user_data["is_active"] = False
-        new_user = await self.create_user(user_data=user_data)
-
-        send_new_user_email.delay(email={"email": new_user.email})
+        async with self.unit_of_work():
+            new_user = await self.create_user(user_data=user_data)
+            # sent by the outbox relay once the user is committed
+            await enqueue_task(
+                self.session, send_new_user_email, email={"email": new_user.email}
+            )
 
         return new_user
 
@@ -127,34 +307,44 @@ class UserService:
             User: The updated user.
         """
 
-        return await UserRepository(self.session).update(
-            model_id=user_id, data=self.hash_password(user_data=user_data)
+        user = await UserRepository(self.session).update(
+            model_id=user_id,
+            data=self.revoke_tokens(await self.hash_password(user_data=user_data)),
         )
+        self.forget_user(user_id)
+        return user
 
     async def update_user_restricted(
-        self, user_id: int, user_data: dict[str, Any], current_user: User
+        self, user_id: int, user_data: dict[str, Any], current_user: User | Principal
     ) -> User | None:
         """Updates a user with authorization checks.
 
         Args:
             user_id (int): ID of the user to be updated.
             user_data (dict[str, Any]): New data for the user.
-            current_user (User): The user making the request.
+            current_user (User | Principal): The user making the request.
 
         Raises:
             AuthorizationFailed: If the current user isn't authorized.
+            UserNotRegistered: If the user to update doesn't exist.
 
         Returns:
             User: The updated user.
         """
-        user = await self.get_user(user_id=user_id)
-
-        if user:
-            if not (current_user.is_admin or user.email == current_user.email):
-                raise AuthorizationFailed
-            user = await self.update_user(user_id=user.id, user_data=user_data)
+        if current_user.is_admin or current_user.id == user_id:
+            # authorized no matter who the target is, update it straight away
+            user = await UserRepository(self.session).update_by_attributes(
+                self.revoke_tokens(await self.hash_password(user_data=user_data)),
+                id=user_id,
+            )
+            if not user:
+                raise UserNotRegistered
+            self.forget_user(user_id)
+            return user
 
-        return user
+        # only queried to tell apart missing users from forbidden ones, the id is enough
+        await self.get_user(user_id=user_id, columns=["id"])
+        raise AuthorizationFailed
 
     async def activate_user(self, email: str) -> User | None:
         """
@@ -162,23 +352,28 @@ class UserService:
 
         Args:
             email (str): email of the user to be activated
+
+        Raises:
+            UserNotRegistered: raised if there's no user with that email
         """
-        inactive_user = await self.get_user(user_email=email)
-        if inactive_user:
-            active_user = await self.update_user(
-                user_id=inactive_user.id, user_data={"is_active": True}
-            )
+        active_user = await UserRepository(self.session).update_by_attributes(
+            self.revoke_tokens({"is_active": True}), email=email
+        )
+        if not active_user:
+            raise UserNotRegistered
 
-            return active_user
-        return None
+        self.forget_user(active_user.id)
+        return active_user
 
-    async def deactivate_user(self, user_id: int, current_user: User) -> User | None:
+    async def deactivate_user(
+        self, user_id: int, current_user: User | Principal
+    ) -> User | None:
         """
         Deactivates a user
 
         Args:
             user_id (int): id of the user to be deactivated
-            current_user (User): current user
+            current_user (User | Principal): current user
 
         Raises:
             AuthorizationFailed: raised if the current user isn't allowed to deactive the user with user_id
@@ -191,14 +386,84 @@ class UserService:
         )
         return inactive_user
 
-    async def delete_user(self, user_id: int, current_user: User) -> User | None:
+    async def delete_user(
+        self, user_id: int, current_user: User | Principal
+    ) -> User | None:
         return await self.deactivate_user(user_id=user_id, current_user=current_user)
 
     async def start_password_reset(self, email: str) -> None:
         user = await self.get_user(user_email=email, raise_exception=False)
 
         if user and user.is_active:
-            send_reset_password_email.delay(email={"email": email})
+            await enqueue_task(
+                self.session, send_reset_password_email, email={"email": email}
+            )
+
+    async def send_bulk_email(
+        self,
+        subject: str,
+        template_name: str,
+        context: dict[str, Any] | None = None,
+        min_id: int | None = None,
+        max_id: int | None = None,
+        chunk_size: int = settings.BULK_EMAIL_CHUNK_SIZE,
+        **filters: object,
+    ) -> int:
+        """Emails every user matching `filters` with an id between `min_id` and `max_id`.
+
+        The recipients are split into `send_bulk_email` tasks of `chunk_size` users,
+        queued through the outbox in one transaction, so either every chunk is sent
+        or none is. Each task renders `template_name` for its recipients.
+
+        Usage:
+        await user_service.send_bulk_email(
+            subject="Planned maintenance",
+            template_name="notice.html",
+            context={"title": "Planned maintenance", "message": "..."},
+            is_active=True,
+        )
+
+        Args:
+            subject (str): Subject of the emails.
+            template_name (str): Built template rendered for each recipient with its `email`.
+            context (dict[str, Any] | None, optional): Rendered in the template, must be JSON serializable. Defaults to None.
+            min_id (int | None, optional): Lowest user id emailed. Defaults to None.
+            max_id (int | None, optional): Highest user id emailed. Defaults to None.
+            chunk_size (int, optional): Recipients per task. Defaults to BULK_EMAIL_CHUNK_SIZE.
+            **filters: User attributes to filter by, e.g. `is_active=True`.
+
+        Returns:
+            int: Number of tasks queued.
+        """
+        repository = UserRepository(self.session)
+        chunks = 0
+
+        async with self.unit_of_work():
+            while True:
+                rows = await repository.get_emails(
+                    limit=chunk_size, min_id=min_id, max_id=max_id, **filters
+                )
+                if not rows:
+                    break
+
+                bulk_email = BulkEmail(
+                    recipients=[email for _, email in rows],
+                    subject=subject,
+                    template_name=template_name,
+                    context=context or {},
+                )
+                await enqueue_task(
+                    self.session,
+                    send_bulk_email,
+                    bulk_email=bulk_email.model_dump(mode="json"),
+                )
+                chunks += 1
+
+                if len(rows) < chunk_size:
+                    break
+                min_id = rows[-1].id + 1
+
+        return chunks
 
     async def finish_password_reset(self, email: str, password: str) -> None:
         """
@@ -208,8 +473,9 @@ class UserService:
             password (str): _description_
         """
 
-        user = await self.get_user(user_email=email, raise_exception=False)
+        async with self.unit_of_work():
+            user = await self.get_user(user_email=email, raise_exception=False)
 
-        if user:
-            user_data = self.hash_password({"password": password})
-            await self.update_user(user_id=user.id, user_data=user_data)
+            if user:
+                user_data = await self.hash_password({"password": password})
+                await self.update_user(user_id=user.id, user_data=user_data)
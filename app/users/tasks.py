@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
+from app.config import settings
 from app.config_celery import app
 from app.email.main import (
     EmailData,
@@ -7,7 +9,15 @@ from app.email.main import (
     generate_reset_password_email,
     send_email,
 )
-from app.email.utils import Email, EmailStatus, generate_email_token
+from app.email.rendering import render_email_template
+from app.email.smtp import get_smtp_pool
+from app.email.utils import (
+    BulkEmail,
+    BulkEmailStatus,
+    Email,
+    EmailStatus,
+    generate_email_token,
+)
 from app.utils import get_logger
 
 logger = get_logger()
@@ -26,26 +36,68 @@ def send_email_task(
     Returns:
         EmailStatus: Status of the email.
     """
-    email_sent = False
-    error = None
-
     email_token = generate_email_token(email.email)
     email_data = email_generator(
         email=email.email, email_to=email.email, token=email_token
     )
 
+    return deliver_email(email.email, email_data)
+
+
+def deliver_email(email_to: str, email_data: EmailData) -> EmailStatus:
+    """Sends `email_data`, failures are logged and reported in the status."""
+    email_sent = False
+    error = None
+
     try:
         send_email(
             html=email_data.html_content,
             subject=email_data.subject,
-            email_to=email.email,
+            email_to=email_to,
         )
         email_sent = True
     except Exception as e:
         error = str(e)
         logger.exception(e)
 
-    return EmailStatus(email=email.email, sent=email_sent, error=error)
+    return EmailStatus(email=email_to, sent=email_sent, error=error)
+
+
+def send_bulk_email_task(bulk_email: BulkEmail) -> BulkEmailStatus:
+    """
+    Sends a chunk of a bulk email, rendered for each recipient.
+
+    Messages are sent over the connections of the SMTP pool of the worker, up to
+    `SMTP_POOL_SIZE` at once, each connection carrying many messages.
+
+    Args:
+        bulk_email: The recipients of the chunk and the email to send them.
+
+    Returns:
+        BulkEmailStatus: How many emails were sent and the ones that failed.
+    """
+
+    def send(recipient: str) -> EmailStatus:
+        html_content = render_email_template(
+            template_name=bulk_email.template_name,
+            context={
+                "project_name": settings.APP_NAME,
+                **bulk_email.context,
+                "email": recipient,
+            },
+        )
+        email_data = EmailData(html_content=html_content, subject=bulk_email.subject)
+        return deliver_email(recipient, email_data)
+
+    with ThreadPoolExecutor(max_workers=get_smtp_pool().max_size) as executor:
+        statuses = list(executor.map(send, bulk_email.recipients))
+
+    failed = [status for status in statuses if not status.sent]
+    logger.info(
+        f"bulk email {bulk_email.subject!r}: sent {len(statuses) - len(failed)}, "
+        f"failed {len(failed)}"
+    )
+    return BulkEmailStatus(sent=len(statuses) - len(failed), failed=failed)
 
 
 @app.task  # type: ignore[misc]
@@ -53,13 +105,21 @@ def hello(number: int) -> int:
     return number * 2
 
 
-@app.task(pydantic=True)  # type: ignore[misc]
+# nobody reads the status, failures are logged
+@app.task(pydantic=True, ignore_result=True)  # type: ignore[misc]
 def send_new_user_email(email: Email) -> EmailStatus:
     """Sends an account activation email."""
     return send_email_task(email, generate_new_account_email)
 
 
-@app.task(pydantic=True)  # type: ignore[misc]
+# nobody reads the status, failures are logged
+@app.task(pydantic=True, ignore_result=True)  # type: ignore[misc]
 def send_reset_password_email(email: Email) -> EmailStatus:
     """Sends a password reset email."""
     return send_email_task(email, generate_reset_password_email)
+
+
+@app.task(pydantic=True, ignore_result=False)  # type: ignore[misc]
+def send_bulk_email(bulk_email: BulkEmail) -> BulkEmailStatus:
+    """Sends a chunk of a bulk email, see `UserService.send_bulk_email`."""
+    return send_bulk_email_task(bulk_email)
@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+from .exceptions import TooManyLoginAttempts
+from .repository import LoginThrottleRepository
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A token bucket holding up to `burst` tokens, refilled with `per_minute` tokens."""
+
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+    @property
+    def refill_seconds(self) -> float:
+        """Seconds an empty bucket takes to be full again."""
+        return self.burst / self.rate
+
+
+class ThrottleBackend(Protocol):
+    async def take(self, session: AsyncSession, key: str, limit: Limit) -> bool:
+        """Takes a token from the bucket of `key`, returns False if it's empty."""
+        ...
+
+    def clear(self) -> None:
+        """Forgets the buckets kept in memory."""
+        ...
+
+
+class MemoryThrottleBackend:
+    """Buckets kept per process, an attacker spreading attempts over N workers gets N times the limit.
+
+    At most `max_size` buckets are kept, the least recently used are dropped first.
+    """
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        self.max_size = max_size
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, session: AsyncSession, key: str, limit: Limit) -> bool:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated_at) * limit.rate)
+
+        taken = tokens >= 1
+        if taken:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+
+        while len(self._buckets) > self.max_size:
+            self._buckets.popitem(last=False)
+        return taken
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class DatabaseThrottleBackend:
+    """Buckets shared by every worker in the `login_throttle` table, one statement per attempt.
+
+    Purge the idle buckets periodically with `appcli purge-login-throttle`.
+    """
+
+    async def take(self, session: AsyncSession, key: str, limit: Limit) -> bool:
+        return await LoginThrottleRepository(session).take(
+            key, rate=limit.rate, capacity=limit.burst, now=time.time()
+        )
+
+    def clear(self) -> None:
+        pass
+
+
+class LoginThrottle:
+    """Limits login attempts per client IP and per account before any password is verified.
+
+    The IP limit slows down credential stuffing from one host, the account limit
+    guessing the password of one user from many hosts.
+
+    Usage:
+    await login_throttle.check(session, ip=request.client.host, email=email)
+    """
+
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        per_ip: Limit,
+        per_account: Limit,
+    ) -> None:
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_account = per_account
+
+    async def check(self, session: AsyncSession, ip: str | None, email: str) -> None:
+        """Takes a token from the buckets of the IP and the account.
+
+        Args:
+            session (AsyncSession): Session used by the database backend.
+            ip (str | None): Address of the client, unknown addresses share a bucket.
+            email (str): Email the client tries to log in as.
+
+        Raises:
+            TooManyLoginAttempts: Raised if either bucket is empty.
+        """
+        if not await self.backend.take(session, f"ip:{ip}", self.per_ip):
+            raise TooManyLoginAttempts(retry_after=1 / self.per_ip.rate)
+        if not await self.backend.take(
+            session, f"account:{email.lower()}", self.per_account
+        ):
+            raise TooManyLoginAttempts(retry_after=1 / self.per_account.rate)
+
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds after which every bucket not updated since is full."""
+        return max(self.per_ip.refill_seconds, self.per_account.refill_seconds)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+login_throttle = LoginThrottle(
+    backend=(
+        DatabaseThrottleBackend()
+        if settings.LOGIN_THROTTLE_BACKEND == "database"
+        else MemoryThrottleBackend()
+    ),
+    per_ip=Limit(
+        per_minute=settings.LOGIN_THROTTLE_IP_PER_MINUTE,
+        burst=settings.LOGIN_THROTTLE_IP_BURST,
+    ),
+    per_account=Limit(
+        per_minute=settings.LOGIN_THROTTLE_ACCOUNT_PER_MINUTE,
+        burst=settings.LOGIN_THROTTLE_ACCOUNT_BURST,
+    ),
+)
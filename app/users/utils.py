@@ -1,10 +1,10 @@
 import re
 import secrets
 import string
+import uuid
 from datetime import timedelta
 from typing import Any
 
-import jwt
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 
@@ -12,12 +12,20 @@ from app.config import settings
 from app.utils import get_current_time
 
 from .exceptions import PasswordGenerationError
+from .keys import get_key_ring
+from .models import User
 
 STRONG_PASSWORD_PATTERN = re.compile(r"^(?=.*[\d])(?=.*[!@#$%^&*])[\w!@#$%^&*]{6,128}$")
 
-PASSWORD_HASH = PasswordHash((Argon2Hasher(),))
-
-ALGORITHM = "HS256"
+PASSWORD_HASH = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.PASSWORD_HASH_TIME_COST,
+            memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+            parallelism=settings.PASSWORD_HASH_PARALLELISM,
+        ),
+    )
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -28,8 +36,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return PASSWORD_HASH.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Like `verify_password`, but also returns a new hash if `hashed_password` was created
+    with other Argon2 parameters than the current ones, None otherwise
+    """
+    return PASSWORD_HASH.verify_and_update(plain_password, hashed_password)
+
+
 def decode_jwt(token: str) -> Any:
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    return get_key_ring().decode(token)
+
+
+def access_token_claims(user: User) -> dict[str, Any]:
+    """
+    Claims identifying `user` in an access token and the token version it's valid for,
+    with `AUTH_STATELESS_TOKENS` they also carry what's needed to authorize the user
+    without querying it
+    """
+    claims: dict[str, Any] = {"sub": user.email, "ver": user.token_version}
+    if settings.AUTH_STATELESS_TOKENS:
+        claims.update(uid=user.id, active=user.is_active, admin=user.is_admin)
+    return claims
 
 
 def create_access_token(
@@ -42,9 +72,26 @@ def create_access_token(
         expire = get_current_time() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    # the jti identifies the token in the revocation denylist
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    to_encode.setdefault("type", "access")
+    return get_key_ring().encode(to_encode)
+
+
+def create_refresh_token(user: User) -> str:
+    """
+    Creates a long lived token only accepted to get new access tokens, it stops being
+    valid when it's revoked or the token version of the user changes
+    """
+    return create_access_token(
+        data={
+            "sub": user.email,
+            "uid": user.id,
+            "ver": user.token_version,
+            "type": "refresh",
+        },
+        expires_delta=timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+    )
 
 
 def generate_random_password(max_attempts: int = 100) -> str:
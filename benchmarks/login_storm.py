@@ -0,0 +1,83 @@
+"""
+Measures the latency of the healthcheck endpoint while a storm of logins verifies
+passwords, with Argon2 run on the event loop like it used to against `password_hasher`.
+
+Run with:
+    uv run python -m benchmarks.login_storm
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.users.hashing import password_hasher
+from app.users.utils import get_password_hash, verify_password
+
+LOGINS = 50
+CONCURRENT_LOGINS = 20
+PASSWORD = "StrongPass123!"
+HASHED_PASSWORD = get_password_hash(PASSWORD)
+
+Verify = Callable[[str, str], Awaitable[bool]]
+
+
+async def blocking_verify(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` called straight from the handler, as it was."""
+    return verify_password(plain_password, hashed_password)
+
+
+async def login_storm(verify: Verify) -> None:
+    semaphore = asyncio.Semaphore(CONCURRENT_LOGINS)
+
+    async def login() -> None:
+        async with semaphore:
+            await verify(PASSWORD, HASHED_PASSWORD)
+
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+
+
+async def healthcheck_latencies(
+    client: AsyncClient, storm: asyncio.Task[None]
+) -> list[float]:
+    """Returns the milliseconds spent per healthcheck request until the storm ends."""
+    latencies = []
+    while not storm.done():
+        start = time.perf_counter()
+        await client.get("/healthcheck")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def run(verify: Verify) -> tuple[float, float, int]:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        await client.get("/healthcheck")  # warm up
+
+        start = time.perf_counter()
+        storm = asyncio.create_task(login_storm(verify))
+        latencies = await healthcheck_latencies(client, storm)
+        elapsed = time.perf_counter() - start
+
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else p50
+    return p50, p99, int(LOGINS / elapsed)
+
+
+async def main() -> None:
+    results = {
+        "blocking": await run(blocking_verify),
+        "executor": await run(password_hasher.verify),
+    }
+
+    print(f"{'':>10} {'p50 ms':>8} {'p99 ms':>8} {'logins/s':>9}")
+    for name, (p50, p99, throughput) in results.items():
+        print(f"{name:>10} {p50:>8.2f} {p99:>8.2f} {throughput:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Compares `BaseRepository.get_by_attributes`, which reuses a cached statement,
+against rebuilding the statement on every lookup like it used to.
+
+Run with:
+    uv run python -m benchmarks.repository_lookup
+"""
+
+import asyncio
+import time
+import tracemalloc
+from typing import Iterable
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import load_only
+
+from app.database.core import Base
+from app.database.unit_of_work import release_after_read
+from app.users.models import User
+from app.users.repository import UserRepository
+
+LOOKUPS = 10_000
+EMAIL = "benchmark@example.com"
+
+
+class UncachedUserRepository(UserRepository):
+    """`get_by_attributes` as it was before statements were cached."""
+
+    def _build_statement(
+        self, columns: Iterable[str] | None = None, **kwargs: object
+    ) -> Select[tuple[User]]:
+        # the same predicates as the cached statement, lower(email) included
+        statement = select(self.model).where(*self._criteria(kwargs))
+        projection = self._projection(columns)
+        if projection:
+            statement = statement.options(
+                load_only(*(getattr(self.model, column) for column in projection))
+            )
+        return statement
+
+    async def get_by_attributes(
+        self, columns: Iterable[str] | None = None, **kwargs: object
+    ) -> User | None:
+        self._validate_keys(kwargs)
+
+        result = await self.session.scalars(self._build_statement(columns, **kwargs))
+        instance = result.first()
+
+        await release_after_read(self.session)
+        return instance
+
+
+async def lookup_cost(repository: UserRepository) -> tuple[float, float]:
+    """Returns the bytes allocated and the microseconds spent per `get_by_attributes` call.
+
+    The bytes are the peak of the memory traced during a call above what was traced
+    before it, the statement and everything built to run it included.
+    """
+    await repository.get_by_attributes(email=EMAIL)  # warm up caches
+
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        await repository.get_by_attributes(email=EMAIL)
+    elapsed = time.perf_counter() - start
+
+    # traced apart, tracing slows every allocation down
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(LOOKUPS):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        await repository.get_by_attributes(email=EMAIL)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    return allocated / LOOKUPS, elapsed / LOOKUPS * 1_000_000
+
+
+async def main() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as session:
+        cached = UserRepository(session)
+        uncached = UncachedUserRepository(session)
+        await cached.create({"email": EMAIL, "hashed_password": "-"})
+
+        results = {
+            "cached": await lookup_cost(cached),
+            "uncached": await lookup_cost(uncached),
+        }
+
+    await engine.dispose()
+
+    print(f"{'':>10} {'bytes/lookup':>13} {'us/lookup':>10}")
+    for name, (allocated, lookup_time) in results.items():
+        print(f"{name:>10} {allocated:>13.0f} {lookup_time:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.pool import InstrumentedPool, instrument_pool, pool_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_pool_metrics() -> None:
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedPool,
+        pool_logging_name="test_pool_metrics",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    instrument_pool(engine)
+
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+        stats = pool_stats({"test": engine})["test"]
+        assert stats["checkouts"] == 1
+        assert stats["checked_out"] == 1
+        assert stats["size"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect().start()
+
+    stats = pool_stats({"test": engine})["test"]
+    assert stats["checked_out"] == 0
+    assert stats["timeouts"] == 1
+    assert stats["max_checkout_seconds"] > 0
+
+    await engine.dispose()
@@ -0,0 +1,53 @@
+from itertools import cycle
+
+import pytest
+from sqlalchemy import create_engine, select, update
+
+from app.database.routing import RoutingSession
+from app.users.models import User
+
+pytestmark = pytest.mark.anyio
+
+primary = create_engine("sqlite://")
+replicas = [create_engine("sqlite://"), create_engine("sqlite://")]
+
+
+async def test_reads_go_to_replicas() -> None:
+    pool = cycle(replicas)
+    first = RoutingSession(bind=primary, replicas=pool)
+    second = RoutingSession(bind=primary, replicas=pool)
+
+    assert first.get_bind(clause=select(User)) is replicas[0]
+    assert first.get_bind(clause=select(User)) is replicas[0]
+    assert second.get_bind(clause=select(User)) is replicas[1]
+
+
+async def test_writes_go_to_primary() -> None:
+    session = RoutingSession(bind=primary, replicas=cycle(replicas))
+
+    assert session.get_bind(clause=update(User)) is primary
+    assert session.get_bind(clause=select(User).with_for_update()) is primary
+
+
+async def test_read_your_writes() -> None:
+    session = RoutingSession(bind=primary, replicas=cycle(replicas))
+
+    assert session.get_bind(clause=select(User).with_for_update()) is primary
+    assert session.get_bind(clause=select(User)) is not primary
+    session.get_bind(clause=update(User))
+    assert session.get_bind(clause=select(User)) is primary
+
+
+async def test_without_read_your_writes() -> None:
+    session = RoutingSession(
+        bind=primary, replicas=cycle(replicas), read_your_writes=False
+    )
+
+    session.get_bind(clause=update(User))
+    assert session.get_bind(clause=select(User)) is not primary
+
+
+async def test_without_replicas() -> None:
+    session = RoutingSession(bind=primary)
+
+    assert session.get_bind(clause=select(User)) is primary
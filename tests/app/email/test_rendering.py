@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from jinja2 import FileSystemLoader
+
+from app.email.rendering import build_templates, create_environment, preload_templates
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_render_from_cache(tmp_path: Path) -> None:
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "hello.html").write_text("<p>Hello {{ username }}</p>")
+    environment = create_environment(tmp_path / "build", tmp_path / "cache")
+
+    assert preload_templates(environment) == ["hello.html"]
+    with patch.object(FileSystemLoader, "get_source") as get_source:
+        html = environment.get_template("hello.html").render(username="<b>a</b>")
+
+    get_source.assert_not_called()
+    assert html == "<p>Hello &lt;b&gt;a&lt;/b&gt;</p>"
+
+
+async def test_bytecode_cache(tmp_path: Path) -> None:
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "hello.html").write_text("<p>Hello</p>")
+
+    preload_templates(create_environment(tmp_path / "build", tmp_path / "cache"))
+
+    assert list((tmp_path / "cache").iterdir())
+
+
+async def test_build_templates(tmp_path: Path) -> None:
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "hello.mjml").write_text("<mjml>{{ username }}</mjml>")
+    # stands in for the MJML CLI, copies the source to the -o path
+    copy = [
+        sys.executable,
+        "-c",
+        "import shutil, sys; shutil.copy(sys.argv[1], sys.argv[3])",
+    ]
+
+    built = build_templates(copy, source_dir, tmp_path / "build")
+
+    assert built == [tmp_path / "build" / "hello.html"]
+    assert built[0].read_text() == "<mjml>{{ username }}</mjml>"
@@ -0,0 +1,115 @@
+import smtplib
+import time
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from app.email.main import send_email
+from app.email.smtp import SMTPConnectionPool
+from tests.utils.smtp import SMTPServer
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def server() -> Iterator[SMTPServer]:
+    with SMTPServer() as server:
+        yield server
+
+
+def create_pool(
+    server: SMTPServer, max_messages: int = 100, keepalive_seconds: float = 30
+) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        host=str(server.host),
+        port=int(server.port),
+        max_messages=max_messages,
+        keepalive_seconds=keepalive_seconds,
+    )
+
+
+async def test_connection_reused(server: SMTPServer) -> None:
+    pool = create_pool(server)
+
+    for _ in range(3):
+        pool.send("app@example.com", ["user@example.com"], "Subject: hi\r\n\r\nhi")
+    pool.close()
+
+    assert len(server.sessions) == 1
+    assert len(server.sessions[0].messages) == 3
+    assert server.sessions[0].commands.count("EHLO") == 1
+
+
+async def test_max_messages(server: SMTPServer) -> None:
+    pool = create_pool(server, max_messages=2)
+
+    for _ in range(5):
+        pool.send("app@example.com", ["user@example.com"], "hi")
+    pool.close()
+
+    assert [len(session.messages) for session in server.sessions] == [2, 2, 1]
+
+
+async def test_keepalive(server: SMTPServer) -> None:
+    pool = create_pool(server, keepalive_seconds=0.01)
+
+    pool.send("app@example.com", ["user@example.com"], "hi")
+    time.sleep(0.02)
+    pool.send("app@example.com", ["user@example.com"], "hi")
+    pool.close()
+
+    assert len(server.sessions) == 1
+    assert "NOOP" in server.sessions[0].commands
+
+
+async def test_reconnect(server: SMTPServer) -> None:
+    pool = create_pool(server)
+    pool.send("app@example.com", ["user@example.com"], "hi")
+
+    server.disconnect()
+    pool.send("app@example.com", ["user@example.com"], "hi")
+    pool.close()
+
+    assert len(server.sessions) == 2
+    assert len(server.sessions[1].messages) == 1
+
+
+async def test_refused_recipient(server: SMTPServer) -> None:
+    pool = create_pool(server)
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send("app@example.com", ["refused@example.com"], "hi")
+    pool.send("app@example.com", ["user@example.com"], "hi")
+    pool.close()
+
+    assert len(server.sessions) == 1
+    assert "RSET" in server.sessions[0].commands
+
+
+async def test_failed_connection_not_reused(server: SMTPServer) -> None:
+    pool = create_pool(server)
+
+    with pytest.raises(smtplib.SMTPDataError):
+        with pool.connection() as smtp:
+            smtp.mail("app@example.com")
+            raise smtplib.SMTPDataError(554, b"Transaction failed")
+    pool.send("app@example.com", ["user@example.com"], "hi")
+    pool.close()
+
+    assert len(server.sessions) == 2
+
+
+async def test_send_email(server: SMTPServer) -> None:
+    pool = create_pool(server)
+
+    with (
+        patch("app.email.main.get_smtp_pool", return_value=pool),
+        patch("app.email.main.settings.EMAILS_FROM_EMAIL", "app@example.com"),
+    ):
+        send_email(html="<p>Hello</p>", subject="Hello", email_to="user@example.com")
+        send_email(html="<p>Hello</p>", subject="Hello", email_to="user@example.com")
+    pool.close()
+
+    assert len(server.sessions) == 1
+    assert "Subject: Hello" in server.sessions[0].messages[0]
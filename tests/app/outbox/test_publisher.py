@@ -0,0 +1,64 @@
+import threading
+from typing import Any
+
+import pytest
+
+from app.outbox.publisher import PublisherBusy, TaskPublisher
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_publish() -> None:
+    published: list[tuple[str, dict[str, Any]]] = []
+    publisher = TaskPublisher(
+        max_queue=10,
+        batch_size=5,
+        send=lambda task, kwargs: published.append((task, kwargs)),
+    )
+
+    await publisher.publish("task", {"number": 1})
+    publisher.close()
+
+    assert published == [("task", {"number": 1})]
+    stats = publisher.stats()
+    assert stats["published"] == 1
+    assert stats["queued"] == 0
+    assert stats["max_publish_seconds"] > 0
+    assert stats["avg_publish_seconds"] == stats["publish_seconds"]
+
+
+async def test_publish_failure() -> None:
+    def send(task: str, kwargs: dict[str, Any]) -> None:
+        raise ConnectionError("broker unreachable")
+
+    publisher = TaskPublisher(max_queue=10, batch_size=5, send=send)
+
+    with pytest.raises(ConnectionError):
+        await publisher.publish("task", {})
+    publisher.close()
+
+    assert publisher.metrics.failed == 1
+
+
+async def test_full_buffer_rejected() -> None:
+    unblock = threading.Event()
+
+    def send(task: str, kwargs: dict[str, Any]) -> None:
+        unblock.wait()
+
+    publisher = TaskPublisher(max_queue=1, batch_size=1, send=send)
+
+    # the first message is taken by the thread, the second fills the buffer
+    first = publisher.submit("task", {})
+    while publisher.stats()["queued"]:
+        pass
+    second = publisher.submit("task", {})
+
+    with pytest.raises(PublisherBusy):
+        await publisher.publish("task", {})
+    assert publisher.metrics.rejected == 1
+
+    unblock.set()
+    first.result(timeout=1)
+    second.result(timeout=1)
+    publisher.close()
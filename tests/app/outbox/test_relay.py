@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.core import Base
+from app.outbox.relay import OutboxRelay, enqueue_task
+from app.outbox.repository import OutboxRepository
+from app.users.tasks import send_new_user_email
+
+engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def test_enqueue_in_unit_of_work(session: AsyncSession) -> None:
+    with pytest.raises(RuntimeError):
+        async with OutboxRepository(session).unit_of_work():
+            await enqueue_task(session, send_new_user_email, email={"email": "a@b.c"})
+            raise RuntimeError
+
+    # rolled back with the change it was about
+    assert await OutboxRepository(session).get_all() == []
+
+
+async def test_relay_batch(session: AsyncSession) -> None:
+    for i in range(3):
+        await enqueue_task(session, send_new_user_email, email={"email": f"{i}@b.c"})
+    published: list[tuple[str, dict[str, Any]]] = []
+
+    async def publish(task: str, kwargs: dict[str, Any]) -> None:
+        published.append((task, kwargs))
+
+    relay = OutboxRelay(batch_size=2, max_attempts=3, publish=publish)
+
+    assert await relay.relay_batch(session) == 2
+    assert await relay.relay_batch(session) == 1
+    assert await relay.relay_batch(session) == 0
+
+    assert published == [
+        (send_new_user_email.name, {"email": {"email": f"{i}@b.c"}}) for i in range(3)
+    ]
+    assert await OutboxRepository(session).get_all() == []
+
+
+async def test_relay_retries_later(session: AsyncSession) -> None:
+    await enqueue_task(session, send_new_user_email, email={"email": "a@b.c"})
+
+    async def publish(task: str, kwargs: dict[str, Any]) -> None:
+        raise ConnectionError("broker unreachable")
+
+    relay = OutboxRelay(batch_size=10, max_attempts=3, publish=publish)
+
+    assert await relay.relay_batch(session) == 1
+    # backed off, not due yet
+    assert await relay.relay_batch(session) == 0
+
+    (message,) = await OutboxRepository(session).get_all()
+    assert message.attempts == 1
+    assert message.last_error == "broker unreachable"
+
+
+async def test_run_reports_stats(session: AsyncSession) -> None:
+    await enqueue_task(session, send_new_user_email, email={"email": "a@b.c"})
+    published: list[str] = []
+    reported: list[int] = []
+
+    async def publish(task: str, kwargs: dict[str, Any]) -> None:
+        published.append(task)
+
+    def stats() -> dict[str, Any]:
+        reported.append(len(published))
+        return {"published": len(published)}
+
+    relay = OutboxRelay(batch_size=10, max_attempts=3, publish=publish, stats=stats)
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(
+            relay.run(AsyncSessionLocal, poll_interval=0.01, stats_interval=0.01),
+            timeout=0.2,
+        )
+
+    # reported while running, not only once it stops
+    assert len(reported) > 1
+    assert reported[-1] == 1
@@ -1,11 +1,18 @@
-from typing import AsyncGenerator
+from datetime import datetime, timedelta
+from typing import Annotated, Any, AsyncGenerator
 
 import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Index, LargeBinary, func, inspect
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.core import Base
-from app.repository import BaseRepository
+from app.database.dependencies import response_columns
+from app.database.unit_of_work import RELEASE_AFTER_READ_KEY
+from app.repository import BaseRepository, decode_cursor, encode_cursor
+from app.schema import DefaultModel, PageSchema
 
 # Define an in-memory SQLite test database
 DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -26,6 +33,32 @@ class PostRepository(BaseRepository[Post]):
     model = Post
 
 
+class Tag(Base):
+    __tablename__ = "tag"
+
+    name: Mapped[str] = mapped_column(nullable=False)
+
+    __table_args__ = (Index("uq_tag_lower_name", func.lower(name), unique=True),)
+
+
+class TagRepository(BaseRepository[Tag]):
+    model = Tag
+    case_insensitive_keys = frozenset({"name"})
+
+
+class Event(Base):
+    __tablename__ = "event"
+
+    starts_at: Mapped[datetime] = mapped_column(index=True)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, index=True)
+    location: Mapped[str | None] = mapped_column(default=None)
+
+
+class EventRepository(BaseRepository[Event]):
+    model = Event
+    case_insensitive_keys = frozenset({"location"})
+
+
 @pytest.fixture(autouse=True)
 async def setup_database() -> AsyncGenerator[None, None]:
     async with engine.begin() as conn:
@@ -84,6 +117,109 @@ async def test_get_by_attributes(repository: PostRepository) -> None:
     assert fetched.name == instance.name
 
 
+async def test_get_by_attributes_reuses_statement(
+    repository: PostRepository,
+) -> None:
+    first = await repository.create({"name": "First"})
+    second = await repository.create({"name": "Second"})
+
+    assert await repository.get_by_attributes(name="First") == first
+    statement = repository._select_by(("name",))
+    assert await repository.get_by_attributes(name="Second") == second
+    assert repository._select_by(("name",)) is statement
+
+
+async def test_get_by_none_attribute(session: AsyncSession) -> None:
+    repository = EventRepository(session)
+    starts_at = datetime(2026, 1, 1)
+    online = await repository.create({"starts_at": starts_at, "payload": b""})
+    onsite = await repository.create(
+        {"starts_at": starts_at, "payload": b"", "location": "Paris"}
+    )
+
+    assert await repository.get_by_attributes(location=None) == online
+    assert await repository.get_by_attributes(location="paris") == onsite
+    assert await repository.get_all_by_attributes(location=None) == [online]
+    assert (await repository.get_page(location=None)).items == [online]
+    assert [event async for event in repository.stream(location=None)] == [online]
+    assert await repository.update_by_attributes({"payload": b"x"}, location=None)
+    assert online.payload == b"x"
+
+
+async def test_get_with_columns(
+    repository: PostRepository, session: AsyncSession
+) -> None:
+    instance = await repository.create({"name": "Projected"})
+    session.expunge_all()
+
+    fetched = await repository.get(int(instance.id), columns=["id"])
+    assert fetched is not None
+    assert fetched.id == instance.id
+    assert inspect(fetched).unloaded == {"name"}
+
+
+async def test_get_page_with_columns(
+    repository: PostRepository, session: AsyncSession
+) -> None:
+    posts = [await repository.create({"name": f"Post {i}"}) for i in range(3)]
+    session.expunge_all()
+
+    page = await repository.get_page(limit=2, columns=["id"])
+    assert [post.id for post in page.items] == [post.id for post in posts[:2]]
+    assert all(inspect(post).unloaded == {"name"} for post in page.items)
+    assert page.next_cursor is not None
+
+
+async def test_get_with_invalid_columns(repository: PostRepository) -> None:
+    with pytest.raises(AttributeError):
+        await repository.get(1, columns=["invalid_column"])
+
+
+async def test_columns_for() -> None:
+    assert PostRepository.columns_for(["name", "id", "not_a_column"]) == ("id", "name")
+
+
+class PostSchema(DefaultModel):
+    id: int
+    title: str
+
+
+async def test_response_columns() -> None:
+    app = FastAPI()
+    PostColumns = Annotated[
+        tuple[str, ...] | None, Depends(response_columns(PostRepository))
+    ]
+
+    @app.get("/post", response_model=PostSchema)
+    async def get_post(columns: PostColumns) -> Any:
+        return {"id": 1, "title": str(columns)}
+
+    @app.get("/posts", response_model=PageSchema[PostSchema])
+    async def get_posts(columns: PostColumns) -> Any:
+        return {"items": [{"id": 1, "title": str(columns)}]}
+
+    @app.get("/raw")
+    async def get_raw(columns: PostColumns) -> Any:
+        return str(columns)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        post = (await client.get("/post")).json()
+        page = (await client.get("/posts")).json()
+        raw = (await client.get("/raw")).json()
+
+    # title isn't a column of Post
+    assert post["title"] == "('id',)"
+    assert page["items"][0]["title"] == "('id',)"
+    assert raw == "None"
+
+
+async def test_invalid_attributes(repository: PostRepository) -> None:
+    with pytest.raises(AttributeError):
+        await repository.get_by_attributes(title="Invalid")
+
+
 async def test_update(repository: PostRepository) -> None:
     """Test updating an instance."""
     instance = await repository.create({"name": "Old Name"})
@@ -91,6 +227,25 @@ async def test_update(repository: PostRepository) -> None:
     assert updated.name == "New Name"
 
 
+async def test_update_not_found(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.update(99999, {"name": "Missing"})
+
+
+async def test_update_by_attributes(repository: PostRepository) -> None:
+    instance = await repository.create({"name": "Old Name"})
+    updated = await repository.update_by_attributes(
+        {"name": "New Name"}, id=instance.id
+    )
+    assert updated is not None
+    assert updated.id == instance.id
+    assert updated.name == "New Name"
+
+    assert (
+        await repository.update_by_attributes({"name": "Other"}, name="Missing") is None
+    )
+
+
 async def test_update_instance(repository: PostRepository) -> None:
     """Test updating an instance without re-fetching."""
     instance = await repository.create({"name": "Before Update"})
@@ -104,3 +259,243 @@ async def test_delete(repository: PostRepository) -> None:
     await repository.delete(instance.id)
     deleted = await repository.get(instance.id)
     assert deleted is None
+
+
+async def test_delete_not_found(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.delete(99999)
+
+
+async def test_get_page(repository: PostRepository) -> None:
+    posts = [await repository.create({"name": f"Post {i}"}) for i in range(5)]
+
+    first_page = await repository.get_page(limit=2)
+    assert [post.id for post in first_page.items] == [post.id for post in posts[:2]]
+    assert first_page.next_cursor is not None
+
+    second_page = await repository.get_page(cursor=first_page.next_cursor, limit=2)
+    assert [post.id for post in second_page.items] == [post.id for post in posts[2:4]]
+    assert second_page.next_cursor is not None
+
+    last_page = await repository.get_page(cursor=second_page.next_cursor, limit=2)
+    assert [post.id for post in last_page.items] == [posts[4].id]
+    assert last_page.next_cursor is None
+
+
+async def test_get_page_with_filters(repository: PostRepository) -> None:
+    await repository.create({"name": "Skipped"})
+    kept = await repository.create({"name": "Kept"})
+
+    page = await repository.get_page(name="Kept")
+    assert [post.id for post in page.items] == [kept.id]
+    assert page.next_cursor is None
+
+
+async def test_get_page_invalid_cursor(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.get_page(cursor="not-a-cursor")
+
+
+async def test_get_page_non_indexed_column(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.get_page(order_by="name")
+
+
+async def test_get_page_by_datetime(session: AsyncSession) -> None:
+    repository = EventRepository(session)
+    start = datetime(2026, 1, 1)
+    events = [
+        await repository.create(
+            {"starts_at": start + timedelta(hours=i), "payload": b""}
+        )
+        for i in reversed(range(3))
+    ]
+
+    first_page = await repository.get_page(order_by="starts_at", limit=2)
+    assert first_page.next_cursor is not None
+    last_page = await repository.get_page(
+        cursor=first_page.next_cursor, order_by="starts_at", limit=2
+    )
+
+    assert [event.id for event in [*first_page.items, *last_page.items]] == [
+        event.id for event in reversed(events)
+    ]
+    assert last_page.next_cursor is None
+
+
+async def test_get_page_invalid_datetime_cursor(session: AsyncSession) -> None:
+    cursor = encode_cursor("starts_at", ["not a date", 1])
+
+    with pytest.raises(ValueError):
+        await EventRepository(session).get_page(cursor=cursor, order_by="starts_at")
+
+
+async def test_get_page_unsupported_column(session: AsyncSession) -> None:
+    with pytest.raises(ValueError):
+        await EventRepository(session).get_page(order_by="payload")
+
+
+async def test_decode_cursor_other_ordering(repository: PostRepository) -> None:
+    await repository.create({"name": "Post 1"})
+    await repository.create({"name": "Post 2"})
+    page = await repository.get_page(limit=1)
+    assert page.next_cursor is not None
+    with pytest.raises(ValueError):
+        decode_cursor(page.next_cursor, "name")
+
+
+async def test_stream(repository: PostRepository) -> None:
+    posts = [await repository.create({"name": f"Post {i}"}) for i in range(5)]
+
+    streamed = [post async for post in repository.stream(yield_per=2)]
+    assert [post.id for post in streamed] == [post.id for post in posts]
+
+
+async def test_create_many(repository: PostRepository) -> None:
+    data = [{"name": f"Bulk {i}"} for i in range(5)]
+    instances = await repository.create_many(data, batch_size=2)
+    assert [instance.name for instance in instances] == [row["name"] for row in data]
+    assert all(instance.id is not None for instance in instances)
+    assert len(await repository.get_all()) == 5
+
+
+async def test_create_many_invalid_keys(repository: PostRepository) -> None:
+    with pytest.raises(AttributeError):
+        await repository.create_many([{"name": "Valid"}, {"title": "Invalid"}])
+
+
+async def test_update_many(repository: PostRepository) -> None:
+    posts = await repository.create_many([{"name": f"Old {i}"} for i in range(3)])
+    await repository.update_many(
+        {post.id: {"name": f"New {post.id}"} for post in posts}, batch_size=2
+    )
+    for post in posts:
+        fetched = await repository.get(post.id)
+        assert fetched is not None
+        assert fetched.name == f"New {post.id}"
+
+
+async def test_update_many_not_found(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.update_many({99999: {"name": "Missing"}})
+
+
+async def test_delete_many_by_ids(repository: PostRepository) -> None:
+    posts = await repository.create_many([{"name": f"Post {i}"} for i in range(5)])
+    deleted = await repository.delete_many(
+        ids=[post.id for post in posts[:3]], batch_size=2
+    )
+    assert sorted(deleted) == [post.id for post in posts[:3]]
+    remaining = await repository.get_all()
+    assert [post.id for post in remaining] == [post.id for post in posts[3:]]
+
+
+async def test_delete_many_by_attributes(repository: PostRepository) -> None:
+    await repository.create_many([{"name": "Delete me"} for _ in range(5)])
+    kept = await repository.create({"name": "Keep me"})
+    deleted = await repository.delete_many(batch_size=2, name="Delete me")
+    assert len(deleted) == 5
+    remaining = await repository.get_all()
+    assert [post.id for post in remaining] == [kept.id]
+
+
+async def test_delete_many_requires_criteria(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.delete_many()
+
+
+async def test_unit_of_work_commits_once(
+    repository: PostRepository, session: AsyncSession
+) -> None:
+    async with repository.unit_of_work():
+        post = await repository.create({"name": "Inside"})
+        await repository.update(post.id, {"name": "Updated"})
+        assert session.in_transaction()
+
+    assert not session.in_transaction()
+    fetched = await repository.get(post.id)
+    assert fetched is not None
+    assert fetched.name == "Updated"
+
+
+async def test_unit_of_work_rolls_back(
+    repository: PostRepository, session: AsyncSession
+) -> None:
+    with pytest.raises(RuntimeError):
+        async with repository.unit_of_work():
+            await repository.create({"name": "Rolled back"})
+            async with repository.unit_of_work():
+                await repository.create({"name": "Nested"})
+            raise RuntimeError
+
+    assert await repository.get_all() == []
+
+
+async def test_release_after_read(
+    repository: PostRepository, session: AsyncSession
+) -> None:
+    post = await repository.create({"name": "Released"})
+
+    await repository.get(post.id)
+    assert session.in_transaction()
+
+    session.info[RELEASE_AFTER_READ_KEY] = True
+    fetched = await repository.get(post.id)
+    assert not session.in_transaction()
+    assert fetched is not None
+    assert fetched.name == "Released"
+
+    async with repository.unit_of_work():
+        await repository.get(post.id)
+        assert session.in_transaction()
+
+
+async def test_insert_or_ignore(repository: PostRepository) -> None:
+    instance = await repository.insert_or_ignore({"name": "New"}, conflict_keys=["id"])
+    assert instance is not None
+    assert instance.name == "New"
+
+    conflicting = await repository.insert_or_ignore(
+        {"id": instance.id, "name": "Conflicting"}, conflict_keys=["id"]
+    )
+    assert conflicting is None
+    fetched = await repository.get(instance.id)
+    assert fetched is not None
+    assert fetched.name == "New"
+
+
+async def test_upsert(repository: PostRepository) -> None:
+    instance = await repository.upsert(
+        {"id": 1, "name": "Created"}, conflict_keys=["id"]
+    )
+    assert instance.name == "Created"
+
+    updated = await repository.upsert(
+        {"id": 1, "name": "Updated"}, conflict_keys=["id"]
+    )
+    assert updated.id == instance.id
+    assert updated.name == "Updated"
+    assert len(await repository.get_all()) == 1
+
+
+async def test_upsert_without_update_keys(repository: PostRepository) -> None:
+    with pytest.raises(ValueError):
+        await repository.upsert({"id": 1}, conflict_keys=["id"])
+
+
+async def test_case_insensitive_keys(session: AsyncSession) -> None:
+    repository = TagRepository(session)
+    tag = await repository.insert_or_ignore({"name": "Python"}, conflict_keys=["name"])
+    assert tag is not None
+
+    assert (
+        await repository.insert_or_ignore({"name": "PYTHON"}, conflict_keys=["name"])
+        is None
+    )
+    fetched = await repository.get_by_attributes(name="python")
+    assert fetched is not None
+    assert fetched.name == "Python"
+
+    updated = await repository.update_by_attributes({"name": "Py"}, name="pYtHoN")
+    assert updated is not None
+    assert updated.id == tag.id
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from celery import Celery  # type: ignore
+from celery.backends.database import session_cleanup  # type: ignore
+from sqlalchemy import func, inspect, select, update
+
+from app.task_results import create_date_done_indexes, purge_expired_results
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_purge_expired_results(tmp_path: Path) -> None:
+    celery_app = Celery(backend=f"db+sqlite:///{tmp_path / 'results.db'}")
+    backend = celery_app.backend
+    for i in range(5):
+        backend.store_result(f"expired-{i}", i, "SUCCESS")
+    backend.store_result("recent", 5, "SUCCESS")
+    backend.save_group("expired-group", celery_app.GroupResult("expired-group", []))
+
+    session = backend.ResultSession()
+    with session_cleanup(session):
+        for model, id_column in (
+            (backend.task_cls, backend.task_cls.task_id),
+            (backend.taskset_cls, backend.taskset_cls.taskset_id),
+        ):
+            session.execute(
+                update(model)
+                .where(id_column.like("expired-%"))
+                .values(date_done=model.date_done - timedelta(days=2))
+            )
+        session.commit()
+
+    deleted = purge_expired_results(backend, expires=timedelta(days=1), batch_size=2)
+
+    assert deleted == 6
+    session = backend.ResultSession()
+    with session_cleanup(session):
+        assert session.scalars(select(backend.task_cls.task_id)).all() == ["recent"]
+        assert session.scalar(select(func.count(backend.taskset_cls.id))) == 0
+
+
+async def test_create_date_done_indexes(tmp_path: Path) -> None:
+    backend = Celery(backend=f"db+sqlite:///{tmp_path / 'results.db'}").backend
+
+    create_date_done_indexes(backend)
+    # already indexed, like the app database by its migrations
+    create_date_done_indexes(backend)
+
+    session = backend.ResultSession()
+    with session_cleanup(session):
+        inspector = inspect(session.get_bind())
+        for table in ("celery_taskmeta", "celery_tasksetmeta"):
+            indexes = inspector.get_indexes(table)
+            assert [index["column_names"] for index in indexes] == [["date_done"]]
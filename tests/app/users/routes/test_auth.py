@@ -1,12 +1,17 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import jwt
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from app.config import settings
 from app.email.utils import generate_email_token
+from app.outbox.repository import OutboxRepository
 from app.users.service import UserService
-from app.users.utils import get_password_hash, verify_password
+from app.users.tasks import send_new_user_email, send_reset_password_email
+from app.users.throttling import Limit, login_throttle
+from app.users.utils import create_access_token, get_password_hash, verify_password
 from tests.factory import UserCreateSchemaFactory, UserFactory
 
 pytestmark = pytest.mark.anyio
@@ -24,6 +29,126 @@ class TestAuthRoutes:
         assert "access_token" in response.json()
         assert "token_type" in response.json()
 
+    @patch.object(settings, "AUTH_STATELESS_TOKENS", True)
+    async def test_stateless_token_revoked(
+        self, client: AsyncClient, session: AsyncSession
+    ) -> None:
+        password = "StrongPass123!"
+        user = await UserFactory.create_async(
+            hashed_password=get_password_hash(password)
+        )
+        response = await client.post(
+            "auth/token", data={"username": user.email, "password": password}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 200
+
+        await UserService(session).deactivate_user(user_id=user.id, current_user=user)
+
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 401
+
+    async def test_access_token_signed_out_everywhere(
+        self, client: AsyncClient, session: AsyncSession
+    ) -> None:
+        password = "StrongPass123!"
+        user = await UserFactory.create_async(
+            hashed_password=get_password_hash(password)
+        )
+        response = await client.post(
+            "auth/token", data={"username": user.email, "password": password}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 200
+
+        await UserService(session).sign_out_everywhere(user_id=user.id)
+
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 401
+
+    async def test_email_token_not_access_token(self, client: AsyncClient) -> None:
+        user = await UserFactory.create_async()
+        headers = {"Authorization": f"Bearer {generate_email_token(user.email)}"}
+
+        response = await client.get("auth/users/me/", headers=headers)
+
+        assert response.status_code == 403
+
+    async def test_access_token_without_jti(self, client: AsyncClient) -> None:
+        user = await UserFactory.create_async()
+        token = jwt.encode(
+            {"sub": user.email, "type": "access"}, settings.SECRET_KEY, "HS256"
+        )
+
+        response = await client.get(
+            "auth/users/me/", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 403
+
+    async def test_reset_password_access_token(self, client: AsyncClient) -> None:
+        user = await UserFactory.create_async()
+        token = create_access_token(data={"sub": user.email})
+
+        response = await client.post(
+            "auth/users/reset_password",
+            json={"token": token, "password": "NewSecurePass123!"},
+        )
+
+        assert response.status_code == 401
+
+    async def test_refresh_token(self, client: AsyncClient) -> None:
+        password = "StrongPass123!"
+        user = await UserFactory.create_async(
+            hashed_password=get_password_hash(password)
+        )
+        response = await client.post(
+            "auth/token", data={"username": user.email, "password": password}
+        )
+        refresh_token = response.json()["refresh_token"]
+
+        response = await client.post(
+            "auth/token/refresh", json={"refresh_token": refresh_token}
+        )
+        assert response.status_code == 200
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 200
+
+        # refresh tokens aren't access tokens
+        headers = {"Authorization": f"Bearer {refresh_token}"}
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 403
+
+    async def test_logout(self, client: AsyncClient) -> None:
+        password = "StrongPass123!"
+        user = await UserFactory.create_async(
+            hashed_password=get_password_hash(password)
+        )
+        response = await client.post(
+            "auth/token", data={"username": user.email, "password": password}
+        )
+        tokens = response.json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = await client.post(
+            "auth/logout",
+            json={"refresh_token": tokens["refresh_token"]},
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+        response = await client.get("auth/users/me/", headers=headers)
+        assert response.status_code == 403
+        response = await client.post(
+            "auth/token/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 401
+
     async def test_login_failure(self, client: AsyncClient) -> None:
         data = {"username": "invalid@example.com", "password": "WrongPass"}
 
@@ -31,17 +156,25 @@ class TestAuthRoutes:
 
         assert response.status_code == 403
 
+    async def test_login_throttled(self, client: AsyncClient) -> None:
+        data = {"username": "user@example.com", "password": "WrongPass"}
+
+        with patch.object(login_throttle, "per_account", Limit(per_minute=1, burst=1)):
+            first = await client.post("auth/token", data=data)
+            second = await client.post("auth/token", data=data)
+
+        assert first.status_code == 403
+        assert second.status_code == 429
+        assert second.headers["retry-after"] == "60"
+
     async def test_generate_password(self, client: AsyncClient) -> None:
         response = await client.get("auth/generate-password")
 
         assert response.status_code == 200
         assert "password" in response.json()
 
-    @patch("app.users.service.send_new_user_email")
     async def test_register_user(
-        self,
-        mock_send_email: MagicMock,
-        client: AsyncClient,
+        self, client: AsyncClient, session: AsyncSession
     ) -> None:
         """Test user registration sends activation email"""
 
@@ -50,19 +183,19 @@ class TestAuthRoutes:
         response = await client.post("auth/users/register", json=user_data)
 
         assert response.status_code == 200
-        mock_send_email.delay.assert_called_once()
+        (message,) = await OutboxRepository(session).get_all()
+        assert message.task == send_new_user_email.name
 
-    @patch("app.users.service.send_reset_password_email")
     async def test_recover_password(
-        self,
-        mock_send_email: MagicMock,
-        client: AsyncClient,
+        self, client: AsyncClient, session: AsyncSession
     ) -> None:
         user = await UserFactory.create_async()
         response = await client.post(f"auth/users/{user.email}/password-recovery")
 
         assert response.status_code == 200
-        mock_send_email.delay.assert_called_once_with(email={"email": user.email})
+        (message,) = await OutboxRepository(session).get_all()
+        assert message.task == send_reset_password_email.name
+        assert message.kwargs == {"email": {"email": user.email}}
 
     async def test_recover_password_nonexistent_user(self, client: AsyncClient) -> None:
         response = await client.post(
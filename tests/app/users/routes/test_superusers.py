@@ -25,7 +25,42 @@ class TestSuperUserRoutes:
         response = await client.get("auth/users", headers=headers)
         assert response.status_code == expected_status
         if is_admin:
-            assert len(response.json()) == len(users) + 1
+            assert len(response.json()["items"]) == len(users) + 1
+            assert response.json()["next_cursor"] is None
+
+    async def test_get_users_pagination(
+        self, client: AsyncClient, session: AsyncGenerator[AsyncSession, None]
+    ) -> None:
+        users = await UserFactory.create_batch_async(3)
+        superuser = await UserFactory.create_async(is_admin=True)
+        headers = create_authorization_headers_for_email(email=superuser.email)
+
+        response = await client.get("auth/users?limit=2", headers=headers)
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page["items"]) == 2
+        assert first_page["next_cursor"]
+
+        response = await client.get(
+            "auth/users",
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        second_page = response.json()
+        assert second_page["next_cursor"] is None
+
+        ids = [user["id"] for user in first_page["items"] + second_page["items"]]
+        assert ids == [user.id for user in users] + [superuser.id]
+
+    async def test_get_users_invalid_cursor(
+        self, client: AsyncClient, session: AsyncGenerator[AsyncSession, None]
+    ) -> None:
+        superuser = await UserFactory.create_async(is_admin=True)
+        headers = create_authorization_headers_for_email(email=superuser.email)
+
+        response = await client.get("auth/users?cursor=invalid", headers=headers)
+        assert response.status_code == 400
 
     @pytest.mark.parametrize("is_admin, expected_status", [(True, 200), (False, 403)])
     async def test_get_user(
@@ -69,3 +104,14 @@ class TestSuperUserRoutes:
 
             assert created_user["email"] == new_user_data["email"]
             assert "id" in created_user
+
+    async def test_sign_out_user(
+        self, client: AsyncClient, session: AsyncGenerator[AsyncSession, None]
+    ) -> None:
+        user = await UserFactory.create_async()
+        superuser = await UserFactory.create_async(is_admin=True)
+        headers = create_authorization_headers_for_email(email=superuser.email)
+
+        response = await client.post(f"auth/users/{user.id}/sign-out", headers=headers)
+        assert response.status_code == 200
+        assert user.token_version == 1
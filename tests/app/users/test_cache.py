@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from app.users.cache import Principal, PrincipalCache
+
+pytestmark = pytest.mark.anyio
+
+PRINCIPAL = Principal(id=1, email="test@example.com", is_active=True, is_admin=False)
+
+
+async def test_get_and_set() -> None:
+    cache = PrincipalCache(ttl=60, max_size=10)
+
+    assert cache.get("token") is None
+    cache.set("token", PRINCIPAL, {})
+    assert cache.get("token") == PRINCIPAL
+
+
+async def test_expired_token_is_not_cached() -> None:
+    cache = PrincipalCache(ttl=60, max_size=10)
+
+    cache.set("token", PRINCIPAL, {"exp": time.time() - 1})
+    assert cache.get("token") is None
+
+
+async def test_ttl() -> None:
+    cache = PrincipalCache(ttl=0.01, max_size=10)
+
+    cache.set("token", PRINCIPAL, {})
+    time.sleep(0.02)
+    assert cache.get("token") is None
+
+
+async def test_least_recently_used_is_evicted() -> None:
+    cache = PrincipalCache(ttl=60, max_size=2)
+
+    cache.set("first", PRINCIPAL, {})
+    cache.set("second", PRINCIPAL, {})
+    cache.get("first")
+    cache.set("third", PRINCIPAL, {})
+
+    assert cache.get("first") == PRINCIPAL
+    assert cache.get("second") is None
+    assert cache.get("third") == PRINCIPAL
+
+
+async def test_invalidate() -> None:
+    cache = PrincipalCache(ttl=60, max_size=10)
+    other = Principal(id=2, email="other@example.com", is_active=True, is_admin=False)
+
+    cache.set("first", PRINCIPAL, {})
+    cache.set("second", PRINCIPAL, {})
+    cache.set("other", other, {})
+    cache.invalidate(PRINCIPAL.id)
+
+    assert cache.get("first") is None
+    assert cache.get("second") is None
+    assert cache.get("other") == other
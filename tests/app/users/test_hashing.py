@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.users.exceptions import PasswordHasherBusy
+from app.users.hashing import PasswordHasher
+from app.users.utils import verify_password
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hash_and_verify() -> None:
+    hasher = PasswordHasher(max_workers=2)
+
+    hashed_password = await hasher.hash("StrongPass123!")
+    assert verify_password("StrongPass123!", hashed_password)
+    assert await hasher.verify("StrongPass123!", hashed_password)
+    assert not await hasher.verify("WrongPass123!", hashed_password)
+
+
+async def test_max_concurrency() -> None:
+    hasher = PasswordHasher(max_workers=4, max_concurrency=2)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def slow_hash(password: str) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return password
+
+    with patch("app.users.hashing.get_password_hash", slow_hash):
+        await asyncio.gather(*(hasher.hash(f"Pass{i}!") for i in range(6)))
+
+    assert peak == 2
+
+
+async def test_max_queue() -> None:
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+
+    def slow_hash(password: str) -> str:
+        time.sleep(0.01)
+        return password
+
+    with patch("app.users.hashing.get_password_hash", slow_hash):
+        results = await asyncio.gather(
+            *(hasher.hash(f"Pass{i}!") for i in range(3)), return_exceptions=True
+        )
+
+    assert results[:2] == ["Pass0!", "Pass1!"]
+    assert isinstance(results[2], PasswordHasherBusy)
@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from httpx import AsyncClient
+
+from app.users.keys import KeyRing
+
+pytestmark = pytest.mark.anyio
+
+SECRET = "a-secret-of-at-least-32-bytes-for-hs256"
+
+
+def write_key(
+    keys_dir: Path, kid: str, public_only: bool = False, algorithm: str = "EdDSA"
+) -> None:
+    private_key: ed25519.Ed25519PrivateKey | ec.EllipticCurvePrivateKey
+    if algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    if public_only:
+        pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    else:
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    (keys_dir / f"{kid}.pem").write_bytes(pem)
+
+
+async def test_sign_with_kid(tmp_path: Path) -> None:
+    write_key(tmp_path, "2026-10")
+    key_ring = KeyRing("EdDSA", SECRET, tmp_path, "2026-10")
+
+    token = key_ring.encode({"sub": "user@example.com"})
+
+    assert jwt.get_unverified_header(token)["kid"] == "2026-10"
+    assert key_ring.decode(token) == {"sub": "user@example.com"}
+
+
+async def test_sign_es256(tmp_path: Path) -> None:
+    write_key(tmp_path, "2026-10", algorithm="ES256")
+    key_ring = KeyRing("ES256", SECRET, tmp_path, "2026-10")
+
+    token = key_ring.encode({"sub": "user@example.com"})
+
+    assert jwt.get_unverified_header(token)["alg"] == "ES256"
+    assert key_ring.decode(token) == {"sub": "user@example.com"}
+    (jwk,) = key_ring.jwks()["keys"]
+    assert jwk["kty"] == "EC"
+    assert "d" not in jwk
+
+
+async def test_rotation_overlap(tmp_path: Path) -> None:
+    write_key(tmp_path, "old")
+    write_key(tmp_path, "new")
+    old_token = KeyRing("EdDSA", SECRET, tmp_path, "old").encode({"sub": "a"})
+
+    key_ring = KeyRing("EdDSA", SECRET, tmp_path, "new")
+
+    assert key_ring.decode(old_token) == {"sub": "a"}
+    assert {key["kid"] for key in key_ring.jwks()["keys"]} == {"old", "new"}
+
+    (tmp_path / "old.pem").unlink()
+    with pytest.raises(jwt.InvalidTokenError):
+        KeyRing("EdDSA", SECRET, tmp_path, "new").decode(old_token)
+
+
+async def test_public_key_only_verifies(tmp_path: Path) -> None:
+    write_key(tmp_path, "signing")
+    write_key(tmp_path, "retired", public_only=True)
+
+    key_ring = KeyRing("EdDSA", SECRET, tmp_path, "signing")
+
+    assert set(key_ring.keys) == {"signing", "retired"}
+    with pytest.raises(ValueError):
+        KeyRing("EdDSA", SECRET, tmp_path, "retired")
+
+
+async def test_jwks_has_no_private_parts(tmp_path: Path) -> None:
+    write_key(tmp_path, "signing")
+
+    (jwk,) = KeyRing("EdDSA", SECRET, tmp_path, "signing").jwks()["keys"]
+
+    assert jwk["kty"] == "OKP"
+    assert jwk["alg"] == "EdDSA"
+    assert "d" not in jwk
+
+
+async def test_reject_other_algorithm(tmp_path: Path) -> None:
+    write_key(tmp_path, "signing")
+    key_ring = KeyRing("EdDSA", SECRET, tmp_path, "signing")
+    token = jwt.encode({"sub": "a"}, SECRET, algorithm="HS256")
+
+    with pytest.raises(jwt.InvalidTokenError):
+        key_ring.decode(token)
+
+
+async def test_jwks_route(client: AsyncClient) -> None:
+    response = await client.get("/.well-known/jwks.json")
+
+    assert response.status_code == 200
+    # symmetric keys are never published
+    assert response.json() == {"keys": []}
+    assert "max-age" in response.headers["cache-control"]
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.core import Base
+from app.users.models import RevokedToken
+from app.users.repository import RevokedTokenRepository
+from app.users.revocation import BloomFilter, RevocationList
+from app.utils import get_current_time
+
+engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def test_bloom_filter() -> None:
+    bloom_filter = BloomFilter(capacity=1000)
+    added = [f"added-{i}" for i in range(1000)]
+    for item in added:
+        bloom_filter.add(item)
+
+    assert all(item in bloom_filter for item in added)
+    false_positives = sum(f"missing-{i}" in bloom_filter for i in range(1000))
+    assert false_positives < 30
+
+
+async def test_revocation_list(session: AsyncSession) -> None:
+    revocation_list = RevocationList(capacity=10, refresh_interval=0)
+    repository = RevokedTokenRepository(session)
+    expires_at = get_current_time() + timedelta(minutes=5)
+
+    assert not await revocation_list.is_revoked(session, "revoked")
+
+    await repository.revoke(jti="revoked", expires_at=expires_at)
+    assert await revocation_list.is_revoked(session, "revoked")
+    assert not await revocation_list.is_revoked(session, "not-revoked")
+
+
+async def test_revocation_list_ignores_expired(session: AsyncSession) -> None:
+    revocation_list = RevocationList(capacity=10, refresh_interval=0)
+    repository = RevokedTokenRepository(session)
+
+    await repository.revoke(
+        jti="expired", expires_at=get_current_time() - timedelta(minutes=5)
+    )
+    await revocation_list.refresh(session)
+    assert "expired" not in revocation_list._filter
+
+    assert await repository.delete_expired() == 1
+
+
+async def test_revocation_list_rereads_overlap(session: AsyncSession) -> None:
+    revocation_list = RevocationList(capacity=10, refresh_interval=0, overlap=60)
+    expires_at = get_current_time() + timedelta(minutes=5)
+
+    # id 1 is allocated first but commits after id 2 was read
+    session.add(RevokedToken(id=2, jti="second", expires_at=expires_at))
+    await session.commit()
+    assert await revocation_list.is_revoked(session, "second")
+
+    session.add(RevokedToken(id=1, jti="first", expires_at=expires_at))
+    await session.commit()
+    assert await revocation_list.is_revoked(session, "first")
+    assert revocation_list._filter.count == 2
@@ -0,0 +1,51 @@
+from typing import Any, Iterator
+from unittest.mock import patch
+
+import pytest
+
+from app.email.smtp import SMTPConnectionPool
+from app.email.utils import BulkEmail
+from app.users.tasks import send_bulk_email_task
+from tests.utils.smtp import SMTPServer
+
+pytestmark = pytest.mark.anyio
+
+
+def render(*, template_name: str, context: dict[str, Any]) -> str:
+    return f"<p>{context['message']} {context['email']}</p>"
+
+
+@pytest.fixture
+def server() -> Iterator[SMTPServer]:
+    with SMTPServer() as server:
+        yield server
+
+
+async def test_send_bulk_email(server: SMTPServer) -> None:
+    pool = SMTPConnectionPool(host=str(server.host), port=int(server.port), max_size=2)
+    recipients = [f"user{i}@example.com" for i in range(10)]
+    bulk_email = BulkEmail(
+        recipients=[*recipients, "refused@example.com"],
+        subject="Notice",
+        template_name="notice.html",
+        context={"message": "Hello"},
+    )
+
+    with (
+        patch("app.users.tasks.render_email_template", render),
+        patch("app.users.tasks.get_smtp_pool", return_value=pool),
+        patch("app.email.main.get_smtp_pool", return_value=pool),
+        patch("app.email.main.settings.EMAILS_FROM_EMAIL", "app@example.com"),
+    ):
+        status = send_bulk_email_task(bulk_email)
+    pool.close()
+
+    assert status.sent == 10
+    assert [failed.email for failed in status.failed] == ["refused@example.com"]
+    assert len(server.sessions) <= 2
+    messages = [message for session in server.sessions for message in session.messages]
+    assert len(messages) == 10
+    assert all(
+        any(f"To: {recipient}" in message for message in messages)
+        for recipient in recipients
+    )
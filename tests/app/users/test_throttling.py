@@ -0,0 +1,107 @@
+import time
+from typing import AsyncGenerator
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.core import Base
+from app.users.exceptions import TooManyLoginAttempts
+from app.users.repository import LoginThrottleRepository
+from app.users.throttling import (
+    DatabaseThrottleBackend,
+    Limit,
+    LoginThrottle,
+    MemoryThrottleBackend,
+)
+
+engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("backend", [MemoryThrottleBackend, DatabaseThrottleBackend])
+async def test_bucket(session: AsyncSession, backend: type) -> None:
+    throttle_backend = backend()
+    limit = Limit(per_minute=60, burst=2)
+
+    assert await throttle_backend.take(session, "key", limit)
+    assert await throttle_backend.take(session, "key", limit)
+    assert not await throttle_backend.take(session, "key", limit)
+    # other buckets are independent
+    assert await throttle_backend.take(session, "other", limit)
+
+
+@pytest.mark.parametrize(
+    ("backend", "clock"),
+    [(MemoryThrottleBackend, "monotonic"), (DatabaseThrottleBackend, "time")],
+)
+async def test_bucket_refill(session: AsyncSession, backend: type, clock: str) -> None:
+    throttle_backend = backend()
+    limit = Limit(per_minute=60, burst=1)
+    now = time.time()
+
+    with patch(f"app.users.throttling.time.{clock}", return_value=now):
+        assert await throttle_backend.take(session, "key", limit)
+        assert not await throttle_backend.take(session, "key", limit)
+    with patch(f"app.users.throttling.time.{clock}", return_value=now + 1):
+        assert await throttle_backend.take(session, "key", limit)
+        assert not await throttle_backend.take(session, "key", limit)
+
+
+async def test_memory_backend_max_size(session: AsyncSession) -> None:
+    throttle_backend = MemoryThrottleBackend(max_size=1)
+    limit = Limit(per_minute=1, burst=1)
+
+    assert await throttle_backend.take(session, "first", limit)
+    assert await throttle_backend.take(session, "second", limit)
+    # evicted, starts full again
+    assert await throttle_backend.take(session, "first", limit)
+
+
+async def test_login_throttle_per_account(session: AsyncSession) -> None:
+    login_throttle = LoginThrottle(
+        backend=MemoryThrottleBackend(),
+        per_ip=Limit(per_minute=60, burst=10),
+        per_account=Limit(per_minute=1, burst=1),
+    )
+
+    await login_throttle.check(session, ip="10.0.0.1", email="user@example.com")
+    with pytest.raises(TooManyLoginAttempts) as exc_info:
+        await login_throttle.check(session, ip="10.0.0.2", email="USER@example.com")
+
+    assert exc_info.value.headers == {"Retry-After": "60"}
+
+
+async def test_login_throttle_per_ip(session: AsyncSession) -> None:
+    login_throttle = LoginThrottle(
+        backend=MemoryThrottleBackend(),
+        per_ip=Limit(per_minute=1, burst=1),
+        per_account=Limit(per_minute=60, burst=10),
+    )
+
+    await login_throttle.check(session, ip="10.0.0.1", email="first@example.com")
+    with pytest.raises(TooManyLoginAttempts):
+        await login_throttle.check(session, ip="10.0.0.1", email="second@example.com")
+
+
+async def test_delete_idle(session: AsyncSession) -> None:
+    repository = LoginThrottleRepository(session)
+    await repository.take("old", rate=1, capacity=1, now=100)
+    await repository.take("new", rate=1, capacity=1, now=200)
+
+    assert await repository.delete_idle(before=150) == 1
+    assert await repository.get_by_attributes(key="old") is None
+    assert await repository.get_by_attributes(key="new") is not None
@@ -1,7 +1,10 @@
+from contextlib import contextmanager
 from copy import deepcopy
-from unittest.mock import MagicMock, patch
+from typing import Any, Iterator
 
 import pytest
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.users.exceptions import (
@@ -10,19 +13,53 @@ from app.users.exceptions import (
     InvalidCredentials,
     UserNotRegistered,
 )
+from app.outbox.repository import OutboxRepository
 from app.users.service import UserService
+from app.users.tasks import (
+    send_bulk_email,
+    send_new_user_email,
+    send_reset_password_email,
+)
 from app.users.utils import get_password_hash, verify_password
+from tests.database import async_engine
 from tests.factory import UserFactory
 
 pytestmark = pytest.mark.anyio
 
 
+async def outbox_tasks(session: AsyncSession) -> list[tuple[str, dict[str, Any]]]:
+    messages = await OutboxRepository(session).get_all()
+    return [(message.task, message.kwargs) for message in messages]
+
+
+@contextmanager
+def recorded_statements() -> Iterator[list[str]]:
+    """Records the SELECT, INSERT, UPDATE and DELETE statements sent to the database."""
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statement: str = args[2]
+        if statement.lstrip().split(" ", 1)[0] in {
+            "SELECT",
+            "INSERT",
+            "UPDATE",
+            "DELETE",
+        }:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
 class TestUserService:
     async def test_hash_password(self, session: AsyncSession) -> None:
         user_data = {"email": "test@example.com", "password": "StrongPass123!"}
         user_service = UserService(session)
         user_data_copy = deepcopy(user_data)  # hash_password modified the original dict
-        hashed_user_data = user_service.hash_password(user_data=user_data_copy)
+        hashed_user_data = await user_service.hash_password(user_data=user_data_copy)
         assert not hashed_user_data.get("password", None)
         assert hashed_user_data["hashed_password"]
         assert verify_password(
@@ -61,6 +98,29 @@ class TestUserService:
         )
         assert authenticated_user.id == user.id
 
+    async def test_authenticate_rehashes_outdated_hash(
+        self, session: AsyncSession
+    ) -> None:
+        password = "StrongPass123!"
+        outdated_hash = Argon2Hasher(time_cost=1, memory_cost=8192).hash(password)
+        user = await UserFactory.create_async(hashed_password=outdated_hash)
+
+        authenticated_user = await UserService(session).authenticate(
+            user.email, password
+        )
+        assert authenticated_user.hashed_password != outdated_hash
+        assert verify_password(password, authenticated_user.hashed_password)
+
+    async def test_update_user_revokes_tokens(self, session: AsyncSession) -> None:
+        user = await UserFactory.create_async()
+        user_service = UserService(session)
+
+        updated_user = await user_service.update_user(
+            user_id=user.id, user_data={"is_admin": not user.is_admin}
+        )
+        assert updated_user.token_version == 1
+        assert await user_service.get_token_version(user.id) == 1
+
     async def test_authenticate_invalid_password(self, session: AsyncSession) -> None:
         user = await UserFactory.create_async()
         user_service = UserService(session)
@@ -83,6 +143,25 @@ class TestUserService:
         with pytest.raises(EmailTaken):
             await user_service.create_user(user_data)
 
+    async def test_create_user_duplicate_email_other_case(
+        self, session: AsyncSession
+    ) -> None:
+        await UserFactory.create_async(email="test@example.com")
+        user_data = {"email": "Test@Example.com", "password": "StrongPass123!"}
+        with pytest.raises(EmailTaken):
+            await UserService(session).create_user(user_data)
+
+    async def test_authenticate_email_other_case(self, session: AsyncSession) -> None:
+        password = "StrongPass123!"
+        user = await UserFactory.create_async(
+            email="test@example.com", hashed_password=get_password_hash(password)
+        )
+
+        authenticated_user = await UserService(session).authenticate(
+            "TEST@example.com", password
+        )
+        assert authenticated_user.id == user.id
+
     async def test_create_super_user(self, session: AsyncSession) -> None:
         user_data = {"email": "test@example.com", "password": "StrongPass123!"}
         user = await UserService(session).create_super_user(user_data)
@@ -90,9 +169,8 @@ class TestUserService:
         assert verify_password("StrongPass123!", user.hashed_password)
         assert user.is_admin
 
-    @patch("app.users.service.send_new_user_email")
     async def test_register_user_sends_activation_email(
-        self, mock_send_email: MagicMock, session: AsyncSession
+        self, session: AsyncSession
     ) -> None:
         user_service = UserService(session)
 
@@ -104,7 +182,9 @@ class TestUserService:
         new_user = await user_service.register_user(user_data=user_data)
 
         assert new_user.is_active is False
-        mock_send_email.delay.assert_called_once_with(email={"email": new_user.email})
+        assert await outbox_tasks(session) == [
+            (send_new_user_email.name, {"email": {"email": new_user.email}})
+        ]
 
     async def test_get_user_not_found(self, session: AsyncSession) -> None:
         user_service = UserService(session)
@@ -158,6 +238,45 @@ class TestUserService:
         assert activated_user
         assert activated_user.is_active is True
 
+    async def test_activate_user_single_statement(self, session: AsyncSession) -> None:
+        user = await UserFactory.create_async(is_active=False)
+
+        with recorded_statements() as statements:
+            await UserService(session).activate_user(email=user.email)
+
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+
+    async def test_update_user_restricted_single_statement(
+        self, session: AsyncSession
+    ) -> None:
+        user = await UserFactory.create_async()
+
+        with recorded_statements() as statements:
+            await UserService(session).update_user_restricted(
+                user.id, {"is_active": False}, user
+            )
+
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+
+    async def test_activate_user_not_registered(self, session: AsyncSession) -> None:
+        user_service = UserService(session)
+
+        with pytest.raises(UserNotRegistered):
+            await user_service.activate_user(email="nonexistent@example.com")
+
+    async def test_update_user_restricted_not_registered(
+        self, session: AsyncSession
+    ) -> None:
+        admin = await UserFactory.create_async(is_admin=True)
+        user_service = UserService(session)
+
+        with pytest.raises(UserNotRegistered):
+            await user_service.update_user_restricted(
+                99999, {"email": "missing@example.com"}, admin
+            )
+
     async def test_deactivate_user(self, session: AsyncSession) -> None:
         admin = await UserFactory.create_async(is_admin=True)
         user = await UserFactory.create_async(is_active=True)
@@ -190,37 +309,78 @@ class TestUserService:
         assert deleted_user
         assert deleted_user.is_active is False
 
-    @patch("app.users.service.send_reset_password_email")
     async def test_start_password_reset_active_user(
-        self, mock_send_email: MagicMock, session: AsyncSession
+        self, session: AsyncSession
     ) -> None:
         user = await UserFactory.create_async()
         user_service = UserService(session)
 
         await user_service.start_password_reset(email=user.email)
 
-        mock_send_email.delay.assert_called_once_with(email={"email": user.email})
+        assert await outbox_tasks(session) == [
+            (send_reset_password_email.name, {"email": {"email": user.email}})
+        ]
 
-    @patch("app.users.service.send_reset_password_email")
     async def test_start_password_reset_inactive_user(
-        self, mock_send_email: MagicMock, session: AsyncSession
+        self, session: AsyncSession
     ) -> None:
         user = await UserFactory.create_async(is_active=False)
         user_service = UserService(session)
 
         await user_service.start_password_reset(email=user.email)
 
-        mock_send_email.delay.assert_not_called()
+        assert await outbox_tasks(session) == []
+
+    async def test_send_bulk_email(self, session: AsyncSession) -> None:
+        users = await UserFactory.create_batch_async(5)
+        await UserFactory.create_async(is_active=False)
+        user_service = UserService(session)
+
+        chunks = await user_service.send_bulk_email(
+            subject="Notice",
+            template_name="notice.html",
+            context={"message": "Hello"},
+            min_id=users[0].id,
+            chunk_size=2,
+            is_active=True,
+        )
+
+        tasks = await outbox_tasks(session)
+        assert chunks == 3
+        assert {task for task, _ in tasks} == {send_bulk_email.name}
+        assert [kwargs["bulk_email"]["recipients"] for _, kwargs in tasks] == [
+            [users[0].email, users[1].email],
+            [users[2].email, users[3].email],
+            [users[4].email],
+        ]
+        assert tasks[0][1]["bulk_email"]["context"] == {"message": "Hello"}
+
+    async def test_send_bulk_email_id_range(self, session: AsyncSession) -> None:
+        users = await UserFactory.create_batch_async(4)
+        user_service = UserService(session)
+
+        chunks = await user_service.send_bulk_email(
+            subject="Notice",
+            template_name="notice.html",
+            min_id=users[1].id,
+            max_id=users[2].id,
+        )
+
+        tasks = await outbox_tasks(session)
+        assert chunks == 1
+        assert tasks[0][1]["bulk_email"]["recipients"] == [
+            users[1].email,
+            users[2].email,
+        ]
 
-    @patch("app.users.service.send_reset_password_email")
     async def test_start_password_reset_nonexistent_user(
-        self, mock_send_email: MagicMock, session: AsyncSession
+        self, session: AsyncSession
     ) -> None:
         user_service = UserService(session)
 
         await user_service.start_password_reset(email="nonexistent@example.com")
 
-        mock_send_email.delay.assert_not_called()
+        assert await outbox_tasks(session) == []
 
     async def test_finish_password_reset_updates_password(
         self, session: AsyncSession
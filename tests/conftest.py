@@ -9,6 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, AsyncTransacti
 from app.config import settings
 from app.database.dependencies import get_session
 from app.main import app
+from app.users.cache import principal_cache, token_versions
+from app.users.revocation import revocation_list
+from app.users.throttling import login_throttle
 from tests.database import async_engine
 from tests.factory import UserFactory
 
@@ -56,6 +59,7 @@ async def session(
     async_session = AsyncSession(
         bind=connection,
         join_transaction_mode="create_savepoint",
+        expire_on_commit=False,  # same as AsyncSessionLocal
     )
 
     yield async_session
@@ -69,6 +73,15 @@ async def set_factory_session(session: AsyncSession) -> None:
     UserFactory.__async_session__ = session
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches() -> Generator[None, None, None]:
+    yield
+    principal_cache.clear()
+    token_versions.clear()
+    revocation_list.clear()
+    login_throttle.clear()
+
+
 @pytest.fixture()
 async def client(
     session: AsyncSession,
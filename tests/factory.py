@@ -16,6 +16,7 @@ class UserFactory(SQLAlchemyFactory[User]):
     email = Use(lambda: UserFactory.__faker__.email())
     hashed_password = Use(get_password_hash, generate_random_password())
     is_active = Use(lambda: True)
+    token_version = Use(lambda: 0)
 
 
 class AuthUserSchemaFactory(ModelFactory[AuthUser]): ...
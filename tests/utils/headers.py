@@ -4,12 +4,12 @@ from app.users.utils import create_access_token
 
 
 def create_authorization_headers_for_email(
-    email: str, headers: dict[str, Any] | None = None
+    email: str, headers: dict[str, Any] | None = None, token_version: int = 0
 ) -> dict[str, Any]:
     if not headers:
         headers = {}
 
-    access_token = create_access_token(data={"sub": email})
+    access_token = create_access_token(data={"sub": email, "ver": token_version})
     bearer = f"Bearer {access_token}"
     headers.update({"Authorization": bearer})
 
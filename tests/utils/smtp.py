@@ -0,0 +1,98 @@
+import socket
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from types import TracebackType
+
+
+@dataclass
+class Session:
+    commands: list[str] = field(default_factory=list)
+    messages: list[str] = field(default_factory=list)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        session = Session()
+        self.server.sessions.append(session)
+        self.server.connections.append(self.connection)
+        self.reply("220 localhost ESMTP stand-in")
+
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            session.commands.append(verb)
+
+            if verb == "EHLO":
+                self.reply("250 localhost")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (line := self.rfile.readline()) != b".\r\n":
+                    data.append(line.decode())
+                session.messages.append("".join(data))
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            elif verb == "RCPT" and "refused" in command:
+                self.reply("550 Mailbox unavailable")
+            elif verb in {"MAIL", "RCPT", "NOOP", "RSET"}:
+                self.reply("250 OK")
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    sessions: list[Session]
+    connections: list[socket.socket]
+
+
+class SMTPServer:
+    """A plain SMTP server recording what it receives, one `Session` per connection.
+
+    Recipients containing "refused" are rejected.
+
+    Usage:
+    with SMTPServer() as server:
+        SMTPConnectionPool(host=server.host, port=server.port)
+    """
+
+    def __init__(self) -> None:
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.sessions = []
+        self._server.connections = []
+        self.host, self.port = self._server.server_address[:2]
+
+    @property
+    def sessions(self) -> list[Session]:
+        return self._server.sessions
+
+    def disconnect(self) -> None:
+        """Drops every open connection without a reply, like an idle timeout."""
+        for connection in self._server.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._server.connections.clear()
+
+    def __enter__(self) -> "SMTPServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._server.shutdown()
+        self._server.server_close()